@@ -0,0 +1,86 @@
+"""Startup-time guard for trivial code_review_app invocations.
+
+--help, --version and argument errors must not pay for importing openai,
+pydantic or dotenv. Each command runs in a fresh interpreter; the script
+exits with code 1 when a median exceeds the budget or a heavy module is
+imported, so it can run in CI or as a pre-commit hook.
+
+    python benchmarks/check_startup.py --runs 10 --budget-ms 100
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODE_REVIEW_APP = os.path.join(REPO_ROOT, "tydzien3", "code-review-app", "code_review_app.py")
+HEAVY_MODULES = ("openai", "pydantic", "dotenv", "httpx", "llm_common")
+
+COMMANDS = {
+    "--help": ["--help"],
+    "--version": ["--version"],
+    "niepełne argumenty": ["-l", "python"],
+    "brak pliku": ["-l", "python", "-o", "1", os.path.join(REPO_ROOT, "brak_pliku.py")],
+}
+
+# Uruchamia aplikację jak skrypt i wypisuje na stderr zaimportowane ciężkie moduły
+PROBE = """
+import runpy, sys
+heavy = {heavy!r}
+try:
+    sys.argv = [{path!r}] + sys.argv[1:]
+    runpy.run_path({path!r}, run_name="__main__")
+except SystemExit:
+    pass
+finally:
+    loaded = sorted(name for name in heavy if name in sys.modules)
+    sys.stderr.write("HEAVY:" + ",".join(loaded) + "\\n")
+"""
+
+
+def measure(arguments, runs, cwd):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CODE_REVIEW_APP, *arguments], cwd=cwd, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def heavy_imports(arguments, cwd):
+    probe = PROBE.format(heavy=HEAVY_MODULES, path=CODE_REVIEW_APP)
+    completed = subprocess.run([sys.executable, "-c", probe, *arguments], cwd=cwd, capture_output=True, text=True)
+    for line in completed.stderr.splitlines():
+        if line.startswith("HEAVY:"):
+            return [name for name in line[len("HEAVY:"):].split(",") if name]
+    return ["?"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kontrola czasu startu code_review_app dla prostych wywołań")
+    parser.add_argument("--runs", type=int, default=7, help="Liczba powtórzeń dla każdego wywołania")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Maksymalna mediana czasu startu")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'wywołanie':<22} {'mediana':>10} {'min':>10}  ciężkie importy")
+    for name, arguments in COMMANDS.items():
+        timings = measure(arguments, max(1, args.runs), REPO_ROOT)
+        heavy = heavy_imports(arguments, REPO_ROOT)
+        median = statistics.median(timings)
+        over_budget = median > args.budget_ms
+        failed = failed or over_budget or bool(heavy)
+        status = "PRZEKROCZONO" if over_budget else ""
+        print(f"{name:<22} {median:>8.1f}ms {min(timings):>8.1f}ms  {', '.join(heavy) or '-'} {status}")
+
+    if failed:
+        print(f"\n❌ Start przekracza {args.budget_ms:.0f}ms lub ładuje ciężkie zależności.")
+        return 1
+    print(f"\n✅ Wszystkie wywołania poniżej {args.budget_ms:.0f}ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
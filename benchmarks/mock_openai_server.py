@@ -0,0 +1,331 @@
+"""Local OpenAI-compatible stand-in server for benchmarks.
+
+Implements the subset of the API used by the apps: POST /v1/responses
+(plain text and json_schema structured output) and POST /v1/chat/completions
+(including SSE streaming). Latency, output throughput and 429 behaviour are
+tunable, so client-side concurrency, retry and caching changes can be
+measured without network access or cost.
+
+    python benchmarks/mock_openai_server.py --port 8400 --latency-ms 300 --tokens-per-second 200
+    OPENAI_BASE_URL=http://127.0.0.1:8400/v1 OPENAI_API_KEY=sk-mock-0000000000000000 python ...
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8400
+STREAM_CHUNK_CHARS = 24
+
+MARKDOWN_REPORT = """## Informacje podstawowe
+- Data: 25.10.2025
+- Uczestnicy: Jan, Anna, Piotr, Kasia
+- Typ spotkania: Spotkanie zespołu
+
+## Podsumowanie
+Zespół omówił nowy projekt. Ustalono podział zadań i termin na koniec miesiąca.
+
+## Kluczowe decyzje
+- Research rynku przed prototypem
+
+## Action Points
+| Osoba | Zadanie | Deadline | Priorytet |
+|-------|---------|----------|----------|
+| Anna | Sprawdzić konkurencję | 31.10.2025 | Wysoki |
+| Piotr | Zrobić prototyp | 31.10.2025 | Średni |
+
+## Problemy i blokery
+- Za mały budżet
+- Brak dostępu do danych
+
+## Następne kroki
+- Kolejne spotkanie za tydzień"""
+
+
+def estimate_tokens(text):
+    return max(1, len(text) // 4)
+
+
+class MockBehaviour:
+    """Tunable server behaviour, shared by all handler threads."""
+
+    def __init__(self, latency_ms=200.0, jitter_ms=0.0, tokens_per_second=0.0,
+                 max_concurrent=0, rate_429=0.0, retry_after=0.0, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_second = tokens_per_second
+        self.max_concurrent = max_concurrent
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._question_ids = itertools.count(1)
+        self.stats = {"requests": 0, "rate_limited": 0}
+
+    def admit(self):
+        """Return False when the request should be answered with 429."""
+        with self._lock:
+            self.stats["requests"] += 1
+            limited = (self.max_concurrent and self._in_flight >= self.max_concurrent) or (
+                self.rate_429 and self._random.random() < self.rate_429
+            )
+            if limited:
+                self.stats["rate_limited"] += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def first_token_delay(self):
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000
+
+    def generation_delay(self, output_tokens):
+        return output_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def next_question_id(self):
+        with self._lock:
+            return next(self._question_ids)
+
+
+def instance_from_schema(schema, definitions=None):
+    """Minimal valid instance of a JSON schema (as sent for structured output)."""
+    definitions = definitions if definitions is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return instance_from_schema(definitions[schema["$ref"].split("/")[-1]], definitions)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return instance_from_schema((options or schema[key])[0], definitions)
+    if "enum" in schema:
+        return schema["enum"][0]
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+    if schema_type == "object":
+        return {name: instance_from_schema(prop, definitions)
+                for name, prop in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return [instance_from_schema(schema.get("items", {}), definitions) for _ in range(2)]
+    if schema_type == "integer":
+        return 1
+    if schema_type == "number":
+        return 1.0
+    if schema_type == "boolean":
+        return True
+    if schema_type == "null":
+        return None
+    return "Przykładowa wartość"
+
+
+def quiz_questions(behaviour, count):
+    questions = []
+    for _ in range(count):
+        question_id = behaviour.next_question_id()
+        questions.append({
+            "question": f"Przykładowe pytanie nr {question_id}?",
+            "a": f"Odpowiedź A{question_id}", "b": f"Odpowiedź B{question_id}",
+            "c": f"Odpowiedź C{question_id}", "d": f"Odpowiedź D{question_id}",
+            "correct_answer": "abcd"[question_id % 4],
+        })
+    return {"questions": questions}
+
+
+def message_text(messages_or_input):
+    if isinstance(messages_or_input, str):
+        return messages_or_input
+    parts = []
+    for message in messages_or_input or []:
+        content = message.get("content", "")
+        parts.append(content if isinstance(content, str) else json.dumps(content, ensure_ascii=False))
+    return "\n".join(parts)
+
+
+def chat_reply(behaviour, body):
+    prompt = message_text(body.get("messages"))
+    questions_match = re.search(r"Stwórz (\d+) pytań", prompt)
+    if questions_match:
+        return json.dumps(quiz_questions(behaviour, int(questions_match.group(1))), ensure_ascii=False)
+    subtopics_match = re.search(r"Wypisz (\d+) różnych zagadnień", prompt)
+    if subtopics_match:
+        count = int(subtopics_match.group(1))
+        return json.dumps({"subtopics": [f"Zagadnienie {i + 1}" for i in range(count)]}, ensure_ascii=False)
+
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return json.dumps(instance_from_schema(response_format["json_schema"]["schema"]), ensure_ascii=False)
+    return "OK"
+
+
+def responses_reply(body):
+    text_format = (body.get("text") or {}).get("format") or {}
+    if text_format.get("type") == "json_schema":
+        return json.dumps(instance_from_schema(text_format["schema"]), ensure_ascii=False)
+    return MARKDOWN_REPORT
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behaviour = MockBehaviour()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if not path.endswith(("/chat/completions", "/responses")):
+            self._send_json(404, {"error": {"message": f"Unknown path {path}", "type": "not_found"}})
+            return
+
+        behaviour = self.behaviour
+        if not behaviour.admit():
+            headers = {"retry-after": str(behaviour.retry_after)} if behaviour.retry_after else {}
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "type": "rate_limit_exceeded"}},
+                            headers)
+            return
+
+        try:
+            time.sleep(behaviour.first_token_delay())
+            if path.endswith("/chat/completions"):
+                self._chat_completions(behaviour, body)
+            else:
+                self._responses(behaviour, body)
+        finally:
+            behaviour.release()
+
+    def _chat_completions(self, behaviour, body):
+        text = chat_reply(behaviour, body)
+        model = body.get("model", "mock")
+        usage = {
+            "prompt_tokens": estimate_tokens(message_text(body.get("messages"))),
+            "completion_tokens": estimate_tokens(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        created = int(time.time())
+
+        if not body.get("stream"):
+            time.sleep(behaviour.generation_delay(usage["completion_tokens"]))
+            self._send_json(200, {
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        delay_per_piece = behaviour.generation_delay(usage["completion_tokens"]) / max(1, len(pieces))
+        base = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created, "model": model}
+        for index, piece in enumerate(pieces):
+            time.sleep(delay_per_piece)
+            finish_reason = "stop" if index == len(pieces) - 1 else None
+            chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": finish_reason}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunk = {**base, "choices": [], "usage": usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _responses(self, behaviour, body):
+        text = responses_reply(body)
+        input_tokens = estimate_tokens(message_text(body.get("input")))
+        output_tokens = estimate_tokens(text)
+        time.sleep(behaviour.generation_delay(output_tokens))
+        self._send_json(200, {
+            "id": "resp_mock", "object": "response", "created_at": int(time.time()),
+            "model": body.get("model", "mock"), "status": "completed",
+            "output": [{
+                "type": "message", "id": "msg_mock", "status": "completed", "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }],
+            "parallel_tool_calls": True, "tool_choice": "auto", "tools": [],
+            "usage": {
+                "input_tokens": input_tokens, "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        })
+
+
+def start_server(behaviour, host="127.0.0.1", port=0):
+    """Start the server in a daemon thread; returns (server, base_url)."""
+    handler = type("BoundMockOpenAIHandler", (MockOpenAIHandler,), {"behaviour": behaviour})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def add_behaviour_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Opóźnienie do pierwszego tokenu")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Losowy dodatek do opóźnienia")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                        help="Przepustowość generowania (0 = bez limitu)")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Powyżej tylu równoległych żądań serwer zwraca 429 (0 = bez limitu)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Prawdopodobieństwo losowego 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Wartość nagłówka retry-after przy 429")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def behaviour_from_args(args):
+    return MockBehaviour(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, tokens_per_second=args.tokens_per_second,
+        max_concurrent=args.max_concurrent, rate_429=args.rate_429, retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokalny serwer udający API OpenAI do benchmarków")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_server(behaviour_from_args(args), args.host, args.port)
+    print(f"Mock OpenAI: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
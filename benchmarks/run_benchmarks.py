@@ -0,0 +1,310 @@
+"""Benchmark harness for the three apps against the local mock OpenAI server.
+
+Every scenario runs in a fresh worker process pointed at the mock server
+(OPENAI_BASE_URL), so peak memory and imports are measured per scenario.
+Reports throughput, p50/p95/p99 latency, process startup time and peak RSS,
+and stores results in benchmarks/results/ for comparison across commits.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenario quiz_generation --latency-ms 500 --max-concurrent 4
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/20260101-120000_abc1234.json
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+APP_DIRS = {
+    "quiz": os.path.join(REPO_ROOT, "tydzien1", "quiz"),
+    "notes": os.path.join(REPO_ROOT, "tydzien2", "meeting-notes-wizard"),
+    "code_review": os.path.join(REPO_ROOT, "tydzien3", "code-review-app"),
+}
+MOCK_API_KEY = "sk-mock-benchmark-0000000000000000"
+
+SAMPLE_CODE = '''def calculate_average(numbers):
+    total = 0
+    for num in numbers:
+        total += num
+    return total / len(numbers)
+'''
+
+STARTUP_COMMANDS = {
+    "code_review_app --help": (
+        [sys.executable, os.path.join(APP_DIRS["code_review"], "code_review_app.py"), "--help"], None),
+    "notes_cli --help": (
+        [sys.executable, os.path.join(APP_DIRS["notes"], "notes_cli.py"), "--help"], None),
+    "import notes_core": ([sys.executable, "-c", "import notes_core"], APP_DIRS["notes"]),
+    "import quiz": ([sys.executable, "-c", "import quiz"], APP_DIRS["quiz"]),
+}
+
+sys.path.insert(0, BENCHMARKS_DIR)
+
+
+# --- scenarios (run inside worker processes) ---
+
+def _timed(operation):
+    start = time.perf_counter()
+    ok = operation()
+    return (time.perf_counter() - start) * 1000, ok
+
+
+def _run_many(operation, requests, concurrency):
+    if concurrency <= 1:
+        return [_timed(operation) for _ in range(requests)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: _timed(operation), range(requests)))
+
+
+def scenario_code_review(options):
+    from code_review_app import CodeReviewApp
+
+    app = CodeReviewApp()
+
+    def review():
+        result = app.review_code(SAMPLE_CODE, "Python", "procentowa 0-100%")
+        return result.improved_code != "Błąd podczas przeglądu kodu"
+
+    return review
+
+
+def scenario_structure_notes(options):
+    from notes_core import EXAMPLE_NOTES, structure_notes
+
+    def structure():
+        report, error = structure_notes(EXAMPLE_NOTES)
+        return error is None
+
+    return structure
+
+
+def scenario_quiz_generation(options):
+    import quiz
+
+    def generate():
+        return len(quiz.generate_quiz_questions("Python podstawy", options["quiz_questions"])) == options["quiz_questions"]
+
+    return generate
+
+
+SCENARIOS = {
+    "code_review_single": ("code_review", scenario_code_review, False),
+    "code_review_batch": ("code_review", scenario_code_review, True),
+    "structure_notes": ("notes", scenario_structure_notes, False),
+    "quiz_generation": ("quiz", scenario_quiz_generation, False),
+}
+
+
+def run_worker(scenario, requests, concurrency, options, output_path):
+    app, function, batch = SCENARIOS[scenario]
+    sys.path.insert(0, APP_DIRS[app])
+
+    # App progress messages would only add noise to benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        operation = function(options)
+        # Warm-up call: SDK import and connection setup belong to startup, not latency
+        operation()
+        start = time.perf_counter()
+        timings = _run_many(operation, requests, concurrency if batch else 1)
+        wall_seconds = time.perf_counter() - start
+
+    try:
+        import resource
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        if sys.platform == "darwin":
+            peak_rss_mb /= 1024
+    except ImportError:
+        peak_rss_mb = None
+
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump({
+            "latencies_ms": [latency for latency, _ in timings],
+            "errors": sum(1 for _, ok in timings if not ok),
+            "wall_seconds": wall_seconds,
+            "peak_rss_mb": peak_rss_mb,
+        }, file)
+
+
+# --- orchestration ---
+
+def percentile(values, fraction):
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(raw):
+    latencies = raw["latencies_ms"]
+    if not latencies:
+        return {"requests": 0, "errors": raw["errors"]}
+    return {
+        "requests": len(latencies),
+        "errors": raw["errors"],
+        "throughput_rps": len(latencies) / raw["wall_seconds"] if raw["wall_seconds"] else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "peak_rss_mb": raw["peak_rss_mb"],
+    }
+
+
+def run_scenario(scenario, args, base_url, workdir):
+    output_path = os.path.join(workdir, f"{scenario}.json")
+    command = [
+        sys.executable, os.path.abspath(__file__), "--worker", scenario,
+        "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+        "--quiz-questions", str(args.quiz_questions), "--worker-output", output_path,
+    ]
+    env = dict(os.environ, OPENAI_BASE_URL=base_url, OPENAI_API_KEY=MOCK_API_KEY)
+    completed = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"failed": completed.stderr.strip().splitlines()[-1:] or ["worker failed"]}
+    with open(output_path, "r", encoding="utf-8") as file:
+        return summarize(json.load(file))
+
+
+def measure_startup(runs):
+    results = {}
+    env = dict(os.environ, OPENAI_API_KEY=MOCK_API_KEY)
+    for name, (command, cwd) in STARTUP_COMMANDS.items():
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            completed = subprocess.run(command, cwd=cwd, env=env, capture_output=True)
+            if completed.returncode != 0:
+                timings = None
+                break
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings)} if timings else None
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def latest_result(exclude=None):
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    paths = [path for path in paths if path != exclude]
+    return paths[-1] if paths else None
+
+
+def print_report(results, baseline=None):
+    base_scenarios = (baseline or {}).get("scenarios", {})
+
+    def delta(current, previous):
+        if current is None or not previous:
+            return ""
+        return f" ({100 * (current - previous) / previous:+.0f}%)"
+
+    print(f"\n{'scenariusz':<22} {'req/s':>14} {'p50 ms':>14} {'p95 ms':>14} {'p99 ms':>14} {'RSS MB':>8} {'błędy':>6}")
+    for name, stats in results["scenarios"].items():
+        if "failed" in stats:
+            print(f"{name:<22} błąd: {' '.join(stats['failed'])}")
+            continue
+        if not stats.get("requests"):
+            print(f"{name:<22} brak pomiarów")
+            continue
+        previous = base_scenarios.get(name, {})
+        cells = [
+            f"{stats['throughput_rps']:.2f}{delta(stats['throughput_rps'], previous.get('throughput_rps'))}",
+            f"{stats['p50_ms']:.0f}{delta(stats['p50_ms'], previous.get('p50_ms'))}",
+            f"{stats['p95_ms']:.0f}{delta(stats['p95_ms'], previous.get('p95_ms'))}",
+            f"{stats['p99_ms']:.0f}{delta(stats['p99_ms'], previous.get('p99_ms'))}",
+        ]
+        rss = f"{stats['peak_rss_mb']:.0f}" if stats.get("peak_rss_mb") else "-"
+        print(f"{name:<22} {cells[0]:>14} {cells[1]:>14} {cells[2]:>14} {cells[3]:>14} {rss:>8} {stats['errors']:>6}")
+
+    base_startup = (baseline or {}).get("startup", {})
+    print(f"\n{'start procesu':<26} {'mediana ms':>16} {'min ms':>10}")
+    for name, stats in results["startup"].items():
+        if stats is None:
+            print(f"{name:<26} {'błąd':>16}")
+            continue
+        previous = (base_startup.get(name) or {}).get("median_ms")
+        median = f"{stats['median_ms']:.0f}{delta(stats['median_ms'], previous)}"
+        print(f"{name:<26} {median:>16} {stats['min_ms']:>10.0f}")
+    if baseline:
+        print(f"\nPorównanie z: {baseline.get('revision')} ({baseline.get('timestamp')})")
+
+
+def parse_arguments():
+    from mock_openai_server import add_behaviour_arguments
+
+    parser = argparse.ArgumentParser(description="Benchmarki aplikacji na lokalnym serwerze mock OpenAI")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenariusz do uruchomienia (domyślnie wszystkie; można podać wiele razy)")
+    parser.add_argument("--requests", type=int, default=10, help="Liczba operacji na scenariusz")
+    parser.add_argument("--concurrency", type=int, default=8, help="Równoległość w scenariuszach wsadowych")
+    parser.add_argument("--quiz-questions", type=int, default=30, help="Liczba pytań w jednym quizie")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Powtórzenia pomiaru startu procesu")
+    parser.add_argument("--compare", help="Plik wyników do porównania (domyślnie ostatni zapisany)")
+    parser.add_argument("--no-save", action="store_true", help="Nie zapisuj wyników")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    add_behaviour_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    options = {"quiz_questions": args.quiz_questions}
+    if args.worker:
+        run_worker(args.worker, args.requests, args.concurrency, options, args.worker_output)
+        return
+
+    from mock_openai_server import behaviour_from_args, start_server
+
+    behaviour = behaviour_from_args(args)
+    server, base_url = start_server(behaviour)
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "settings": {key: value for key, value in vars(args).items() if not key.startswith("worker")},
+        "scenarios": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for scenario in args.scenario or list(SCENARIOS):
+                print(f"Scenariusz: {scenario}...")
+                results["scenarios"][scenario] = run_scenario(scenario, args, base_url, workdir)
+    finally:
+        server.shutdown()
+    results["mock_server"] = behaviour.stats
+    results["startup"] = measure_startup(args.startup_runs)
+
+    baseline_path = args.compare or latest_result()
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_report(results, baseline)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"{stamp}_{results['revision']}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        print(f"\nZapisano wyniki: {os.path.relpath(path, REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Common LLM client layer for the ready4ai apps.
+
+Importing this package is cheap: the OpenAI SDK is loaded on the first API call.
+"""
+from .cache import InMemoryCache, request_key
+from .cassette import Cassette, CassetteMissError, InjectedError
+from .client import DEFAULT_MODEL, LLMClient, get_client, is_retryable
+from .metrics import (
+    LatencyHistogram,
+    estimate_cost,
+    latency_histogram,
+    render_prometheus,
+    start_metrics_server,
+    summary,
+    write_summary,
+)
+from .usage import UsageTracker, usage_tracker
+
+__all__ = [
+    "Cassette",
+    "CassetteMissError",
+    "DEFAULT_MODEL",
+    "InMemoryCache",
+    "InjectedError",
+    "LLMClient",
+    "LatencyHistogram",
+    "UsageTracker",
+    "estimate_cost",
+    "get_client",
+    "is_retryable",
+    "latency_histogram",
+    "render_prometheus",
+    "request_key",
+    "start_metrics_server",
+    "summary",
+    "usage_tracker",
+    "write_summary",
+]
@@ -0,0 +1,44 @@
+"""Response caching hooks.
+
+Any object with get(key) and set(key, value) can be passed as cache to
+LLMClient; InMemoryCache is the simple LRU implementation used by default
+when caching is switched on.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def request_key(operation, kwargs):
+    """Stable hash of an API call: operation name plus JSON-serialized arguments."""
+
+    def default(value):
+        # Pydantic models passed as text_format are identified by their schema name
+        if isinstance(value, type):
+            return f"{value.__module__}.{value.__qualname__}"
+        return repr(value)
+
+    payload = json.dumps({"operation": operation, "kwargs": kwargs}, sort_keys=True, default=default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class InMemoryCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,196 @@
+"""Record/replay of LLM calls for deterministic, network-free runs.
+
+In record mode every call goes to the API and its response is saved as a
+cassette file, one per request (keyed by request_key). In replay mode
+responses come from the cassettes only, with optional simulated latency,
+re-chunking of streamed responses and injected retryable errors.
+
+Configured through environment variables (read by LLMClient):
+    LLM_CASSETTE_MODE          off | record | replay
+    LLM_CASSETTE_DIR           cassette directory (default: <repo>/cassettes)
+    LLM_REPLAY_LATENCY_MS      delay before each replayed response
+    LLM_REPLAY_CHUNK_CHARS     re-chunk streamed content into pieces of this size
+    LLM_REPLAY_CHUNK_DELAY_MS  delay between replayed stream chunks
+    LLM_REPLAY_ERROR_RATE      probability (0-1) of an injected retryable error
+    LLM_REPLAY_SEED            seed for error injection
+"""
+import json
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from .cache import request_key
+
+DEFAULT_CASSETTE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cassettes")
+MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recording for the request."""
+
+
+class InjectedError(RuntimeError):
+    """Simulated transient API failure; retried like a rate limit."""
+
+    retryable = True
+
+
+def _dump(obj):
+    if isinstance(obj, bytes):
+        return f"<{len(obj)} bytes>"
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, dict):
+        return {key: _dump(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_dump(value) for value in obj]
+    return repr(obj)
+
+
+def _to_namespace(data):
+    """Recorded JSON back to an object with attribute access, like SDK models."""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: _to_namespace(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return [_to_namespace(value) for value in data]
+    return data
+
+
+def _stream_content(chunk):
+    choices = chunk.get("choices") or []
+    if not choices:
+        return ""
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+class Cassette:
+    def __init__(self, directory, mode="replay", latency_ms=0.0, chunk_chars=0,
+                 chunk_delay_ms=0.0, error_rate=0.0, seed=0):
+        if mode not in MODES:
+            raise ValueError(f"Nieznany tryb kasety: {mode} (dozwolone: {', '.join(MODES)})")
+        self.directory = directory
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.chunk_chars = chunk_chars
+        self.chunk_delay_ms = chunk_delay_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Cassette configured by LLM_* variables, or None when the mode is off."""
+        mode = os.getenv("LLM_CASSETTE_MODE", "off").strip().lower()
+        if mode in ("", "off"):
+            return None
+        return cls(
+            os.getenv("LLM_CASSETTE_DIR", DEFAULT_CASSETTE_DIR),
+            mode=mode,
+            latency_ms=float(os.getenv("LLM_REPLAY_LATENCY_MS", "0")),
+            chunk_chars=int(os.getenv("LLM_REPLAY_CHUNK_CHARS", "0")),
+            chunk_delay_ms=float(os.getenv("LLM_REPLAY_CHUNK_DELAY_MS", "0")),
+            error_rate=float(os.getenv("LLM_REPLAY_ERROR_RATE", "0")),
+            seed=int(os.getenv("LLM_REPLAY_SEED", "0")),
+        )
+
+    def path_for(self, app, operation, kwargs):
+        return os.path.join(self.directory, app, f"{request_key(operation, kwargs)}.json")
+
+    def invoke(self, app, operation, kwargs, send):
+        """Record the result of send(operation, kwargs), or replay it from disk."""
+        path = self.path_for(app, operation, kwargs)
+        if self.mode == "record":
+            response = send(operation, kwargs)
+            if kwargs.get("stream"):
+                return self._record_stream(path, operation, kwargs, response)
+            self._save(path, operation, kwargs, {"response": _dump(response), "extras": {
+                "output_text": getattr(response, "output_text", None),
+                "output_parsed": _dump(getattr(response, "output_parsed", None)),
+            }})
+            return response
+        return self._replay(path, operation, kwargs)
+
+    # --- recording ---
+
+    def _save(self, path, operation, kwargs, payload):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        request = {key: value for key, value in kwargs.items() if key != "text_format"}
+        if "text_format" in kwargs:
+            request["text_format"] = kwargs["text_format"].__name__
+        record = {"operation": operation, "request": _dump(request), **payload}
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(record, file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    def _record_stream(self, path, operation, kwargs, stream):
+        chunks = []
+        try:
+            for chunk in stream:
+                chunks.append(_dump(chunk))
+                yield chunk
+        except GeneratorExit:
+            # The caller stopped early (e.g. the quiz already has enough questions):
+            # read the rest of the stream so the cassette is complete
+            try:
+                chunks.extend(_dump(chunk) for chunk in stream)
+            except Exception:
+                return
+            self._save(path, operation, kwargs, {"stream_chunks": chunks})
+            raise
+        # An error raised by the API stream propagates before this point and leaves no cassette
+        self._save(path, operation, kwargs, {"stream_chunks": chunks})
+
+    # --- replay ---
+
+    def _replay(self, path, operation, kwargs):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                record = json.load(file)
+        except FileNotFoundError:
+            raise CassetteMissError(f"Brak nagrania dla {operation}: {path}")
+
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if self.error_rate:
+            with self._random_lock:
+                failed = self._random.random() < self.error_rate
+            if failed:
+                raise InjectedError(f"Wstrzyknięty błąd dla {operation}")
+
+        if "stream_chunks" in record:
+            return self._replay_stream(record["stream_chunks"])
+
+        response = _to_namespace(record["response"])
+        extras = record.get("extras") or {}
+        if extras.get("output_text") is not None:
+            response.output_text = extras["output_text"]
+        if extras.get("output_parsed") is not None and "text_format" in kwargs:
+            response.output_parsed = kwargs["text_format"].model_validate(extras["output_parsed"])
+        return response
+
+    def _replay_stream(self, chunks):
+        if self.chunk_chars > 0:
+            chunks = self._rechunk(chunks)
+        for chunk in chunks:
+            if self.chunk_delay_ms:
+                time.sleep(self.chunk_delay_ms / 1000)
+            yield _to_namespace(chunk)
+
+    def _rechunk(self, chunks):
+        """Spread the recorded stream content over chunks of chunk_chars characters."""
+        content = "".join(_stream_content(chunk) for chunk in chunks)
+        template = next((chunk for chunk in chunks if chunk.get("choices")), None)
+        trailing = [chunk for chunk in chunks if not chunk.get("choices")]
+        if template is None:
+            return chunks
+
+        rechunked = []
+        for start in range(0, len(content), self.chunk_chars):
+            choice = dict(template["choices"][0], delta={"content": content[start:start + self.chunk_chars]})
+            rechunked.append(dict(template, choices=[choice]))
+        return rechunked + trailing
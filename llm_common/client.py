@@ -0,0 +1,249 @@
+"""Shared OpenAI client layer used by the quiz, meeting notes and code review apps.
+
+LLMClient exposes the same call shape as the OpenAI SDK for the endpoints the
+apps use (responses.create, responses.parse, chat.completions.create,
+audio.transcriptions.create) and adds connection pooling with keep-alive,
+timeouts, retry with exponential backoff, optional response caching and usage
+accounting with latency metrics (see llm_common.metrics). Tuning happens here, through constructor arguments or LLM_*
+environment variables.
+"""
+import logging
+import os
+import random
+import threading
+import time
+
+from .cache import InMemoryCache, request_key
+from .cassette import Cassette
+from .metrics import install_exporters_from_env, latency_histogram
+from .usage import usage_tracker
+
+# Fallbacks for unset LLM_* variables. LLMClient reads the variables when it is
+# created, so settings from a .env file loaded after this import still apply.
+# Apps with long generations (code review) pass a longer timeout themselves.
+FALLBACK_MODEL = "gpt-4.1-mini"
+FALLBACK_TIMEOUT_SECONDS = 60.0
+FALLBACK_MAX_RETRIES = 3
+FALLBACK_MAX_CONNECTIONS = 20
+# Value at import time; apps load .env before importing llm_common
+DEFAULT_MODEL = os.getenv("LLM_MODEL", FALLBACK_MODEL)
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+logger = logging.getLogger(__name__)
+
+def _setting(name, fallback, convert=str):
+    value = os.getenv(name, "").strip()
+    return convert(value) if value else fallback
+
+
+_openai_clients = {}
+_openai_clients_lock = threading.Lock()
+
+
+def _shared_openai_client(api_key, timeout, max_connections):
+    """One pooled OpenAI client per configuration, shared by every LLMClient in the process."""
+    key = (api_key, timeout, max_connections)
+    with _openai_clients_lock:
+        if key not in _openai_clients:
+            # Heavy imports deferred until the first real API call
+            import httpx
+            from openai import DefaultHttpxClient, OpenAI
+
+            http_client = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            # Retries are handled by LLMClient, uniformly for every app
+            _openai_clients[key] = OpenAI(
+                api_key=api_key, timeout=timeout, max_retries=0, http_client=http_client
+            )
+        return _openai_clients[key]
+
+
+def is_retryable(error):
+    """Rate limits, connection problems/timeouts and 5xx responses are worth retrying."""
+    if getattr(error, "retryable", False):
+        return True
+    try:
+        import openai
+    except ImportError:
+        return False
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+
+def is_timeout(error):
+    """Request timed out; the server may still have generated (and billed) the response."""
+    try:
+        import openai
+    except ImportError:
+        return False
+    return isinstance(error, openai.APITimeoutError)
+
+
+def retry_delay(error, attempt, base=BACKOFF_BASE_SECONDS, maximum=BACKOFF_MAX_SECONDS):
+    """Retry-After from the response when present, otherwise exponential backoff with jitter."""
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(maximum, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return random.uniform(0.5, 1.0) * min(maximum, base * (2 ** attempt))
+
+
+class _Endpoint:
+    def __init__(self, client, name):
+        self._client = client
+        self._name = name
+
+    def create(self, **kwargs):
+        return self._client.call(f"{self._name}.create", kwargs)
+
+    def parse(self, **kwargs):
+        return self._client.call(f"{self._name}.parse", kwargs)
+
+
+class _Chat:
+    def __init__(self, client):
+        self.completions = _Endpoint(client, "chat.completions")
+
+
+class _Audio:
+    def __init__(self, client):
+        self.transcriptions = _Endpoint(client, "audio.transcriptions")
+
+
+class LLMClient:
+    """Drop-in replacement for the subset of the OpenAI client used by the apps.
+
+    app names the caller in usage accounting and metrics. cache is any object with
+    get(key)/set(key, value); pass cache=True for an in-memory LRU cache.
+    Streaming calls are never cached. cassette records or replays calls
+    (see llm_common.cassette); by default it is configured from LLM_CASSETTE_*.
+    """
+
+    def __init__(self, app, api_key=None, model=None, timeout=None, max_retries=None, max_connections=None,
+                 cache=None, usage=usage_tracker, cassette=None, latency=latency_histogram):
+        self.app = app
+        self.api_key = api_key
+        self.model = model or _setting("LLM_MODEL", FALLBACK_MODEL)
+        self.timeout = timeout if timeout is not None else _setting(
+            "LLM_TIMEOUT_SECONDS", FALLBACK_TIMEOUT_SECONDS, float)
+        self.max_retries = max_retries if max_retries is not None else _setting(
+            "LLM_MAX_RETRIES", FALLBACK_MAX_RETRIES, int)
+        self.max_connections = max_connections if max_connections is not None else _setting(
+            "LLM_MAX_CONNECTIONS", FALLBACK_MAX_CONNECTIONS, int)
+        self.cache = InMemoryCache() if cache is True else cache
+        self.usage = usage
+        self.latency = latency
+        self.cassette = cassette if cassette is not None else Cassette.from_env()
+        self.responses = _Endpoint(self, "responses")
+        self.chat = _Chat(self)
+        self.audio = _Audio(self)
+        install_exporters_from_env()
+
+    @property
+    def openai(self):
+        api_key = self.api_key or os.getenv("OPENAI_API_KEY")
+        return _shared_openai_client(api_key, self.timeout, self.max_connections)
+
+    def _resolve(self, operation):
+        target = self.openai
+        for name in operation.split("."):
+            target = getattr(target, name)
+        return target
+
+    def _send(self, operation, kwargs):
+        """Single attempt of an API call; the only place that talks to the SDK."""
+        return self._resolve(operation)(**kwargs)
+
+    def _invoke(self, operation, kwargs):
+        if self.cassette is not None:
+            return self.cassette.invoke(self.app, operation, kwargs, self._send)
+        return self._send(operation, kwargs)
+
+    def call(self, operation, kwargs):
+        kwargs = dict(kwargs)
+        kwargs.setdefault("model", self.model)
+        model = kwargs["model"]
+        stream = bool(kwargs.get("stream"))
+
+        cache_key = None
+        if self.cache is not None and not stream:
+            cache_key = request_key(operation, kwargs)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.usage.add(self.app, model, operation, calls=1, cache_hits=1)
+                return cached
+
+        if stream and operation == "chat.completions.create":
+            # Last chunk then carries token usage for accounting
+            kwargs.setdefault("stream_options", {"include_usage": True})
+
+        start = time.perf_counter()
+        try:
+            response = self._call_with_retries(operation, model, kwargs, stream)
+        finally:
+            # For streams this is the time to the first response, not to the last chunk
+            self.latency.observe(self.app, model, operation, time.perf_counter() - start)
+
+        if stream:
+            return self._track_stream(operation, model, response)
+        self.usage.record_usage(self.app, model, operation, getattr(response, "usage", None))
+        if cache_key is not None:
+            self.cache.set(cache_key, response)
+        return response
+
+    def _call_with_retries(self, operation, model, kwargs, stream=False):
+        attempt = 0
+        while True:
+            try:
+                response = self._invoke(operation, kwargs)
+                self.usage.add(self.app, model, operation, calls=1)
+                return response
+            except Exception as error:
+                # APITimeoutError is an APIConnectionError, but a timed-out non-streaming call
+                # would be generated and billed again in full on every retry
+                retryable = is_retryable(error) and (stream or not is_timeout(error))
+                if attempt >= self.max_retries or not retryable:
+                    self.usage.add(self.app, model, operation, calls=1, errors=1)
+                    raise
+                delay = retry_delay(error, attempt)
+                self.usage.add(self.app, model, operation, retries=1)
+                logger.warning(
+                    "%s %s: %s; ponowienie %d/%d za %.1fs",
+                    self.app, operation, error, attempt + 1, self.max_retries, delay,
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def _track_stream(self, operation, model, stream):
+        try:
+            for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage is not None:
+                    self.usage.record_usage(self.app, model, operation, usage)
+                yield chunk
+        finally:
+            # Closes the connection (or lets a recording cassette finish) as soon as the caller stops reading
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(app, **kwargs):
+    """Process-wide LLMClient for an app, created on first use."""
+    with _clients_lock:
+        if app not in _clients:
+            _clients[app] = LLMClient(app, **kwargs)
+        return _clients[app]
@@ -0,0 +1,232 @@
+"""Metrics export: Prometheus text format and JSON summaries of LLM calls.
+
+Counters come from UsageTracker; request latency is kept in LatencyHistogram.
+Costs are estimated from token usage with PRICES_PER_MILLION_TOKENS.
+
+Configured through environment variables (read when the first LLMClient is created):
+    LLM_METRICS_FILE   write a JSON summary to this path when the process exits (CLI runs)
+    LLM_METRICS_PORT   serve GET /metrics on this port from a background thread
+    LLM_METRICS_HOST   bind address for LLM_METRICS_PORT (default: 127.0.0.1)
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from .usage import usage_tracker
+
+LATENCY_BUCKETS_SECONDS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (text input, output); dated snapshots match by prefix
+PRICES_PER_MILLION_TOKENS = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o-transcribe": (2.50, 10.00),
+    "gpt-4o-mini-transcribe": (1.25, 5.00),
+}
+# USD per 1M audio input tokens; transcription input is mostly audio
+AUDIO_INPUT_PRICES_PER_MILLION_TOKENS = {
+    "gpt-4o-transcribe": 6.00,
+    "gpt-4o-mini-transcribe": 3.00,
+}
+
+
+def _lookup_price(table, model):
+    """Price for the longest matching model name in table, or None."""
+    matches = [name for name in table if model == name or model.startswith(f"{name}-")]
+    if not matches:
+        return None
+    return table[max(matches, key=len)]
+
+
+def model_prices(model):
+    """(input, output) price per 1M tokens for the longest matching model name, or None."""
+    return _lookup_price(PRICES_PER_MILLION_TOKENS, model)
+
+
+def estimate_cost(model, input_tokens, output_tokens, input_audio_tokens=0):
+    """Estimated cost in USD, or None for models missing from the price table.
+
+    input_audio_tokens is the audio part of input_tokens and uses the audio
+    input price when the model has one.
+    """
+    prices = model_prices(model)
+    if prices is None:
+        return None
+    audio_price = _lookup_price(AUDIO_INPUT_PRICES_PER_MILLION_TOKENS, model)
+    if audio_price is None:
+        audio_price = prices[0]
+    text_input_tokens = max(0, input_tokens - input_audio_tokens)
+    return (text_input_tokens * prices[0] + input_audio_tokens * audio_price + output_tokens * prices[1]) / 1_000_000
+
+
+def _row_cost(row):
+    return estimate_cost(row["model"], row["input_tokens"], row["output_tokens"], row.get("input_audio_tokens", 0))
+
+
+class LatencyHistogram:
+    """Thread-safe request latency histograms per (app, model, operation)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_SECONDS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = defaultdict(lambda: {"counts": [0] * len(self.buckets), "count": 0, "sum": 0.0, "max": 0.0})
+
+    def observe(self, app, model, operation, seconds):
+        with self._lock:
+            series = self._series[(app, model, operation)]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["count"] += 1
+            series["sum"] += seconds
+            series["max"] = max(series["max"], seconds)
+
+    def snapshot(self):
+        """Return a list of {app, model, operation, counts, count, sum, max} rows (counts per bucket)."""
+        with self._lock:
+            return [
+                {"app": app, "model": model, "operation": operation, **series, "counts": list(series["counts"])}
+                for (app, model, operation), series in self._series.items()
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+latency_histogram = LatencyHistogram()
+
+
+def _labels(row, **extra):
+    labels = {"app": row["app"], "model": row["model"], "operation": row["operation"], **extra}
+    text = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"')) for name, value in labels.items()
+    )
+    return "{" + text + "}"
+
+
+def render_prometheus(usage=usage_tracker, latency=latency_histogram):
+    """All LLM metrics in the Prometheus text exposition format."""
+    usage_rows = usage.snapshot()
+    counters = [
+        ("llm_requests_total", "calls", "LLM API calls, including cache hits"),
+        ("llm_errors_total", "errors", "LLM API calls that failed after retries"),
+        ("llm_retries_total", "retries", "Retried LLM API attempts"),
+        ("llm_cache_hits_total", "cache_hits", "LLM calls served from cache"),
+    ]
+    lines = []
+    for name, field, help_text in counters:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_labels(row)} {row[field]}" for row in usage_rows]
+
+    lines += ["# HELP llm_tokens_total Tokens reported in API usage", "# TYPE llm_tokens_total counter"]
+    for row in usage_rows:
+        lines.append(f"llm_tokens_total{_labels(row, direction='input')} {row['input_tokens']}")
+        lines.append(f"llm_tokens_total{_labels(row, direction='output')} {row['output_tokens']}")
+
+    name = "llm_input_audio_tokens_total"
+    lines += [f"# HELP {name} Audio part of input tokens", f"# TYPE {name} counter"]
+    lines += [f"{name}{_labels(row)} {row['input_audio_tokens']}" for row in usage_rows if row["input_audio_tokens"]]
+
+    lines += ["# HELP llm_cost_usd_total Estimated cost from token usage", "# TYPE llm_cost_usd_total counter"]
+    for row in usage_rows:
+        cost = _row_cost(row)
+        if cost is not None:
+            lines.append(f"llm_cost_usd_total{_labels(row)} {cost:.6f}")
+
+    name = "llm_request_duration_seconds"
+    lines += [f"# HELP {name} LLM call latency including retries", f"# TYPE {name} histogram"]
+    for row in latency.snapshot():
+        cumulative = 0
+        for bound, count in zip(latency.buckets, row["counts"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(row, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(row, le='+Inf')} {row['count']}")
+        lines.append(f"{name}_sum{_labels(row)} {row['sum']:.6f}")
+        lines.append(f"{name}_count{_labels(row)} {row['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def summary(usage=usage_tracker, latency=latency_histogram):
+    """Per-series counters, tokens, cost and latency plus totals, as a JSON-serializable dict."""
+    latency_rows = {(row["app"], row["model"], row["operation"]): row for row in latency.snapshot()}
+    series = []
+    for row in usage.snapshot():
+        timing = latency_rows.get((row["app"], row["model"], row["operation"]))
+        series.append({
+            **row,
+            "cost_usd": _row_cost(row),
+            "latency_avg_seconds": timing["sum"] / timing["count"] if timing and timing["count"] else None,
+            "latency_max_seconds": timing["max"] if timing else None,
+        })
+    totals = {field: sum(row[field] for row in series) for field in usage.FIELDS}
+    totals["cost_usd"] = sum(row["cost_usd"] or 0.0 for row in series)
+    return {"generated_at": datetime.now().isoformat(timespec="seconds"), "totals": totals, "series": series}
+
+
+def write_summary(path, usage=usage_tracker, latency=latency_histogram):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(summary(usage, latency), file, ensure_ascii=False, indent=2)
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve GET /metrics from a daemon thread; returns the HTTP server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+_env_exporters_installed = False
+_env_exporters_lock = threading.Lock()
+
+
+def install_exporters_from_env():
+    """Set up LLM_METRICS_FILE / LLM_METRICS_PORT exporters once per process."""
+    global _env_exporters_installed
+    with _env_exporters_lock:
+        if _env_exporters_installed:
+            return
+        _env_exporters_installed = True
+
+    summary_path = os.getenv("LLM_METRICS_FILE")
+    if summary_path:
+        atexit.register(write_summary, summary_path)
+    port = os.getenv("LLM_METRICS_PORT")
+    if port:
+        try:
+            start_metrics_server(int(port), os.getenv("LLM_METRICS_HOST", "127.0.0.1"))
+        except (OSError, ValueError) as e:
+            # Another process (e.g. a Streamlit rerun worker) may already hold the port
+            logger.warning("Nie uruchomiono serwera metryk na porcie %s: %s", port, e)
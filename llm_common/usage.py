@@ -0,0 +1,59 @@
+"""Usage accounting shared by all LLM calls in the process."""
+import threading
+from collections import defaultdict
+
+
+def usage_tokens(usage):
+    """Return (input_tokens, output_tokens) from a Responses or Chat Completions usage object."""
+    if usage is None:
+        return 0, 0
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_tokens", 0)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "completion_tokens", 0)
+    return input_tokens or 0, output_tokens or 0
+
+
+def audio_input_tokens(usage):
+    """Audio part of input tokens (transcriptions report it in input_token_details)."""
+    details = getattr(usage, "input_token_details", None) or getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "audio_tokens", 0) or 0
+
+
+class UsageTracker:
+    """Thread-safe counters of calls, errors, cache hits and tokens per (app, model, operation)."""
+
+    # input_audio_tokens is the audio share of input_tokens, priced separately
+    FIELDS = ("calls", "errors", "retries", "cache_hits", "input_tokens", "input_audio_tokens", "output_tokens")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def add(self, app, model, operation, **counts):
+        with self._lock:
+            totals = self._totals[(app, model, operation)]
+            for name, value in counts.items():
+                totals[name] += value
+
+    def record_usage(self, app, model, operation, usage):
+        input_tokens, output_tokens = usage_tokens(usage)
+        self.add(app, model, operation, input_tokens=input_tokens, output_tokens=output_tokens,
+                 input_audio_tokens=audio_input_tokens(usage) if usage is not None else 0)
+
+    def snapshot(self):
+        """Return a list of {app, model, operation, calls, ...} rows."""
+        with self._lock:
+            return [
+                {"app": app, "model": model, "operation": operation, **totals}
+                for (app, model, operation), totals in self._totals.items()
+            ]
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+
+usage_tracker = UsageTracker()
@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+import time
+
+ANSWER_FIELDS = ["question", "a", "b", "c", "d", "correct_answer"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    question TEXT NOT NULL,
+    a TEXT NOT NULL,
+    b TEXT NOT NULL,
+    c TEXT NOT NULL,
+    d TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    times_served INTEGER NOT NULL DEFAULT 0,
+    last_served_at REAL,
+    UNIQUE (topic, question_key)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_topic_served ON questions (topic, times_served);
+"""
+
+
+def normalize_topic(quiz_topic):
+    """Klucz tematu: bez wielkości liter, nadmiarowych spacji i końcowej interpunkcji."""
+    return " ".join(str(quiz_topic).casefold().split()).strip(" .!?'\"")
+
+
+class QuestionBank:
+    """Lokalny bank zwalidowanych pytań (SQLite) indeksowany znormalizowanym tematem.
+
+    key_func wyznacza klucz deduplikacji pytania (np. quiz.question_key);
+    wynik jest serializowany do JSON i musi być unikalny w ramach tematu.
+    """
+
+    def __init__(self, path, key_func):
+        self.path = path
+        self.key_func = key_func
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def _serialize_key(self, question_item):
+        key = self.key_func(question_item)
+        return json.dumps(key, default=sorted, ensure_ascii=False)
+
+    def add_questions(self, quiz_topic, questions_list):
+        """Zapisuje pytania; zwraca tylko te, których jeszcze nie było w banku (z polem 'id')."""
+        topic = normalize_topic(quiz_topic)
+        added = []
+        now = time.time()
+        with self._lock, self._connection:
+            for question_item in questions_list:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO questions "
+                    "(topic, question_key, question, a, b, c, d, correct_answer, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (topic, self._serialize_key(question_item),
+                     *(str(question_item[field]) for field in ANSWER_FIELDS), now),
+                )
+                if cursor.rowcount:
+                    added.append({**question_item, "id": cursor.lastrowid})
+        return added
+
+    def sample(self, quiz_topic, count, include_seen=False):
+        """Losuje do count pytań; domyślnie tylko takie, które nie były jeszcze zadane."""
+        query = "SELECT * FROM questions WHERE topic = ?"
+        if not include_seen:
+            query += " AND times_served = 0"
+        query += " ORDER BY times_served, RANDOM() LIMIT ?"
+
+        with self._lock:
+            rows = self._connection.execute(query, (normalize_topic(quiz_topic), count)).fetchall()
+        return [{"id": row["id"], **{field: row[field] for field in ANSWER_FIELDS}} for row in rows]
+
+    def question_texts(self, quiz_topic, limit):
+        """Treści do limit najnowszych pytań z tematu (do listy pytań, których model ma nie powtarzać)."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT question FROM questions WHERE topic = ? ORDER BY id DESC LIMIT ?",
+                (normalize_topic(quiz_topic), limit),
+            ).fetchall()
+        return [row["question"] for row in rows]
+
+    def mark_served(self, questions_list):
+        now = time.time()
+        rows = [(now, question_item["id"]) for question_item in questions_list if "id" in question_item]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE questions SET times_served = times_served + 1, last_served_at = ? WHERE id = ?",
+                rows,
+            )
+
+    def topic_stats(self, quiz_topic):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) AS total, "
+                "COALESCE(SUM(times_served = 0), 0) AS unseen, "
+                "COALESCE(SUM(times_served), 0) AS times_served "
+                "FROM questions WHERE topic = ?",
+                (normalize_topic(quiz_topic),),
+            ).fetchone()
+        return dict(row)
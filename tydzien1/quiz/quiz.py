@@ -1,14 +1,82 @@
 from dotenv import load_dotenv
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import itertools
 import json
+import os
+import queue
+import threading
 
+# Przed importem llm_common, by ustawienia LLM_* z .env były już widoczne
 load_dotenv()
-client = OpenAI()
 
-# Nazwa modelu, którego użyjemy do generowania pytań
-MODEL_NAME = "gpt-4.1-mini"
+from llm_common import DEFAULT_MODEL, get_client
+from question_bank import QuestionBank
 
-def generate_quiz_questions(quiz_topic, num_questions):
+client = get_client("quiz")
+
+# Nazwa modelu, którego użyjemy do generowania pytań (wspólna konfiguracja: LLM_MODEL)
+MODEL_NAME = DEFAULT_MODEL
+
+# Duże quizy dzielimy na partie generowane równolegle
+BATCH_SIZE = 10
+MAX_PARALLEL_REQUESTS = 4
+MAX_TOP_UP_ROUNDS = 3
+# Ile dotychczasowych pytań podajemy modelowi przy dogenerowaniu, by ich nie powtarzał
+MAX_AVOID_QUESTIONS = 30
+# Przy liście pytań do ominięcia ten sam prompt z temperature=0 zwracałby te same pytania
+TOP_UP_TEMPERATURE = 0.7
+
+# Lokalny bank pytań współdzielony między uruchomieniami
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_bank.sqlite3")
+
+REQUIRED_FIELDS = ["question", "a", "b", "c", "d", "correct_answer"]
+
+# Schemat dla structured output; model, który go nie wspiera, dostaje sam prompt
+QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "quiz_questions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "questions": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "question": {"type": "string"},
+                            "a": {"type": "string"},
+                            "b": {"type": "string"},
+                            "c": {"type": "string"},
+                            "d": {"type": "string"},
+                            "correct_answer": {"type": "string", "enum": ["a", "b", "c", "d"]},
+                        },
+                        "required": REQUIRED_FIELDS,
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["questions"],
+            "additionalProperties": False,
+        },
+    },
+}
+_structured_output_supported = True
+_structured_output_lock = threading.Lock()
+
+# Wątki w tle (prefetch) ustawiają quiet, by nie przeplatać komunikatów z pytaniami quizu
+_thread_state = threading.local()
+
+def log(message):
+    if not getattr(_thread_state, "quiet", False):
+        print(message)
+
+def _set_quiet(quiet):
+    _thread_state.quiet = quiet
+
+def build_messages(quiz_topic, num_questions, subtopic=None, avoid_questions=None):
     # Prompt systemowy: opisujemy format i oczekiwania treści
     system_prompt = (
         "Jesteś asystentem generującym pytania do quizu. "
@@ -31,51 +99,28 @@ def generate_quiz_questions(quiz_topic, num_questions):
     user_prompt = (
         f"Stwórz {num_questions} pytań do quizu na temat: '{quiz_topic}'. "
     )
+    if subtopic:
+        user_prompt += f"Skup się na zagadnieniu: '{subtopic}'. "
+    if avoid_questions:
+        avoided = "\n".join(f"- {text}" for text in avoid_questions[:MAX_AVOID_QUESTIONS])
+        user_prompt += f"Nie powtarzaj tych pytań:\n{avoided}"
 
-    # Użyjemy Chat Completions i wymusimy JSON promptem
-    model_name = MODEL_NAME
-
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
 
-    # Informujemy użytkownika, że trwa generowanie pytań
-    print("Generuję pytania...")
-
-    # Wymuszamy JSON przez prompt oraz walidujemy strukturę po stronie klienta
-
-    try:
-        completion = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=0,
-        )
-        content = completion.choices[0].message.content if getattr(completion, "choices", None) else ""
-        if not content:
-            print("[debug] Pusta odpowiedź modelu.")
-            return []
-        try:
-            json_data = json.loads(content)
-        except Exception as parse_err:
-            print(f"[debug] Nie udało się sparsować odpowiedzi jako JSON: {parse_err}")
-            print(f"[debug] content (skrócone): {content[:400]}")
-            return []
-    except Exception as e:
-        print(f"Błąd generowania pytań: {e}")
-        return []
-
-    if not isinstance(json_data, dict) or "questions" not in json_data:
-        print("Model nie zwrócił poprawnych danych (brak pola 'questions').")
-        return []
-
+def validate_questions(question_items):
+    """Zwraca poprawne pytania (ze znormalizowaną literą odpowiedzi) i liczniki pominiętych."""
     questions_list = []
     skipped_missing_fields = 0
     skipped_invalid_values = 0
-    for question_item in json_data.get("questions", []):
-        has_all_fields = all(
-            key in question_item for key in ["question", "a", "b", "c", "d", "correct_answer"]
-        )
+    for question_item in question_items:
+        if not isinstance(question_item, dict):
+            skipped_invalid_values += 1
+            continue
+
+        has_all_fields = all(key in question_item for key in REQUIRED_FIELDS)
         if not has_all_fields:
             skipped_missing_fields += 1
             continue
@@ -93,14 +138,376 @@ def generate_quiz_questions(quiz_topic, num_questions):
         else:
             skipped_invalid_values += 1
 
+    return questions_list, skipped_missing_fields, skipped_invalid_values
+
+def _normalize_text(text):
+    return " ".join(str(text).lower().split()).rstrip("?.!")
+
+def question_key(question_item):
+    """Klucz deduplikacji: znormalizowana treść pytania i zbiór odpowiedzi."""
+    answers = frozenset(_normalize_text(question_item[letter]) for letter in ("a", "b", "c", "d"))
+    return _normalize_text(question_item["question"]), answers
+
+def _is_response_format_error(error):
+    """Czy błąd 400 (BadRequestError) dotyczy response_format/json_schema (a nie np. długości kontekstu)."""
+    if getattr(error, "status_code", None) != 400:
+        return False
+    param = str(getattr(error, "param", "") or "")
+    code = str(getattr(error, "code", "") or "")
+    if param.startswith("response_format"):
+        return True
+    message = f"{error} {getattr(error, 'body', '')}".lower()
+    return code in ("unsupported_parameter", "unsupported_value") and (
+        "response_format" in message or "json_schema" in message
+    )
+
+def _create_completion(messages, temperature=0, **kwargs):
+    """Najpierw structured output ze schematem JSON; przy braku wsparcia sam prompt."""
+    global _structured_output_supported
+    with _structured_output_lock:
+        use_structured = _structured_output_supported
+    if use_structured:
+        try:
+            return client.chat.completions.create(
+                model=MODEL_NAME,
+                messages=messages,
+                temperature=temperature,
+                response_format=QUESTIONS_RESPONSE_FORMAT,
+                **kwargs,
+            )
+        except Exception as e:
+            # Bez importu openai.BadRequestError (ładowanie SDK przy imporcie modułu);
+            # inne błędy 400 (kontekst, polityka treści) nie mają nic wspólnego ze schematem
+            if not _is_response_format_error(e):
+                raise
+            log(f"[debug] Structured output niedostępny, przechodzę na sam prompt: {e}")
+            with _structured_output_lock:
+                _structured_output_supported = False
+
+    return client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=messages,
+        temperature=temperature,
+        **kwargs,
+    )
+
+def request_questions(quiz_topic, num_questions, subtopic=None, avoid_questions=None):
+    """Jedno zapytanie do modelu; zwraca listę zwalidowanych pytań (pustą przy błędzie)."""
+    messages = build_messages(quiz_topic, num_questions, subtopic, avoid_questions)
+
+    try:
+        completion = _create_completion(messages, temperature=TOP_UP_TEMPERATURE if avoid_questions else 0)
+        content = completion.choices[0].message.content if getattr(completion, "choices", None) else ""
+        if not content:
+            log("[debug] Pusta odpowiedź modelu.")
+            return []
+    except Exception as e:
+        log(f"Błąd generowania pytań: {e}")
+        return []
+
+    # Uszkodzony lub ucięty JSON nie przekreśla całej generacji - odzyskujemy pełne obiekty
+    question_items, fully_parsed = salvage_questions(content)
+    if not fully_parsed:
+        log(f"[debug] Odpowiedź nie była poprawnym JSON; odzyskano pytań: {len(question_items)}.")
+        log(f"[debug] content (skrócone): {content[:400]}")
+
+    questions_list, skipped_missing_fields, skipped_invalid_values = validate_questions(question_items)
+
     if skipped_missing_fields or skipped_invalid_values:
-        print(
+        log(
             f"Pominięto pytania: brak pól={skipped_missing_fields}, puste/niepoprawne wartości={skipped_invalid_values}."
         )
 
+    return questions_list
+
+def generate_subtopics(quiz_topic, count):
+    """Prosi model o listę różnych zagadnień w ramach tematu (pusta lista przy błędzie)."""
+    messages = [
+        {"role": "system", "content": 'Zwróć WYŁĄCZNIE JSON: {"subtopics": ["...", "..."]}'},
+        {"role": "user", "content": f"Wypisz {count} różnych zagadnień w ramach tematu: '{quiz_topic}'."},
+    ]
+    try:
+        completion = client.chat.completions.create(
+            model=MODEL_NAME,
+            messages=messages,
+            temperature=0,
+        )
+        subtopics = json.loads(completion.choices[0].message.content).get("subtopics", [])
+    except Exception as e:
+        log(f"[debug] Nie udało się pobrać zagadnień: {e}")
+        return []
+    return [str(item).strip() for item in subtopics if str(item).strip()][:count]
+
+def split_into_batches(num_questions, batch_size=BATCH_SIZE):
+    batches = [batch_size] * (num_questions // batch_size)
+    if num_questions % batch_size:
+        batches.append(num_questions % batch_size)
+    return batches
+
+def generate_quiz_questions(quiz_topic, num_questions, cancel_event=None, avoid_questions=None):
+    """Pytania z modelu; avoid_questions to treści, których model ma nie powtarzać (np. z banku)."""
+    # Informujemy użytkownika, że trwa generowanie pytań
+    log("Generuję pytania...")
+
+    questions_list = []
+    seen_keys = set()
+    subtopics = []
+
+    for round_number in range(1 + MAX_TOP_UP_ROUNDS):
+        missing = num_questions - len(questions_list)
+        if missing <= 0 or (cancel_event is not None and cancel_event.is_set()):
+            break
+
+        if round_number:
+            log(f"Dogenerowuję pytania: brakuje {missing} z {num_questions}.")
+
+        batches = split_into_batches(missing)
+        if len(batches) > 1 and not subtopics:
+            subtopics = generate_subtopics(quiz_topic, len(batches))
+        # Najpierw pytania z tego uruchomienia, potem przekazane z zewnątrz (limit MAX_AVOID_QUESTIONS)
+        round_avoid = [item["question"] for item in questions_list] + list(avoid_questions or [])
+
+        with ThreadPoolExecutor(
+            max_workers=MAX_PARALLEL_REQUESTS,
+            initializer=_set_quiet,
+            initargs=(getattr(_thread_state, "quiet", False),),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    request_questions,
+                    quiz_topic,
+                    batch_size,
+                    subtopics[index % len(subtopics)] if subtopics else None,
+                    round_avoid or None,
+                )
+                for index, batch_size in enumerate(batches)
+            ]
+            # Kolejność partii zachowujemy, by wynik był powtarzalny
+            for future in futures:
+                for question_item in future.result():
+                    key = question_key(question_item)
+                    if key not in seen_keys:
+                        seen_keys.add(key)
+                        questions_list.append(question_item)
+
     return questions_list[:num_questions]
 
-def run_quiz(questions_list):
+class QuestionStreamParser:
+    """Przyrostowy parser JSON: zwraca obiekty pytań, gdy tylko zostaną domknięte.
+
+    Za pytanie uznajemy każdy obiekt, którego rodzicem jest lista, np. elementy
+    "questions": [...]. Tekst poza JSON (np. blok ```json) jest ignorowany.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._containers = []
+        self._object_start = None
+        self._object_depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        completed = []
+        for char in text:
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                inside_list = bool(self._containers) and self._containers[-1] == "["
+                if char == "{" and inside_list and self._object_start is None:
+                    self._object_start = len(self._buffer) - 1
+                    self._object_depth = len(self._containers)
+                self._containers.append(char)
+            elif char in "}]":
+                if self._containers:
+                    self._containers.pop()
+                if char == "}" and self._object_start is not None and len(self._containers) == self._object_depth:
+                    raw = "".join(self._buffer[self._object_start:])
+                    self._object_start = None
+                    try:
+                        completed.append(json.loads(raw))
+                    except ValueError:
+                        pass
+        return completed
+
+def _strip_code_fences(content):
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+    if text.rstrip().endswith("```"):
+        text = text.rstrip()[:-3]
+    return text.strip()
+
+def salvage_questions(content):
+    """Zwraca (obiekty pytań, czy_cały_JSON_poprawny).
+
+    Gdy JSON jest uszkodzony lub ucięty, odzyskuje każdy domknięty obiekt z listy.
+    """
+    text = _strip_code_fences(content)
+    try:
+        json_data = json.loads(text)
+    except ValueError:
+        return QuestionStreamParser().feed(text), False
+
+    if isinstance(json_data, dict) and isinstance(json_data.get("questions"), list):
+        return json_data["questions"], True
+    if isinstance(json_data, list):
+        return json_data, True
+    log("Model nie zwrócił poprawnych danych (brak pola 'questions').")
+    return [], True
+
+def stream_quiz_questions(quiz_topic, num_questions, avoid_questions=None):
+    """Generator pytań: każde poprawne pytanie jest zwracane, gdy tylko model je dokończy."""
+    log("Generuję pytania (strumieniowo)...")
+    parser = QuestionStreamParser()
+    seen_keys = set()
+
+    try:
+        stream = _create_completion(
+            build_messages(quiz_topic, num_questions, avoid_questions=avoid_questions),
+            temperature=TOP_UP_TEMPERATURE if avoid_questions else 0,
+            stream=True,
+        )
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            for question_item in parser.feed(delta):
+                valid, _, _ = validate_questions([question_item])
+                if not valid or question_key(valid[0]) in seen_keys:
+                    continue
+                seen_keys.add(question_key(valid[0]))
+                yield valid[0]
+                if len(seen_keys) >= num_questions:
+                    return
+    except Exception as e:
+        log(f"Błąd generowania pytań: {e}")
+
+    # Brakujące pytania (ucięta lub niepełna odpowiedź) dogenerowujemy zwykłą ścieżką
+    missing = num_questions - len(seen_keys)
+    if missing > 0 and seen_keys:
+        for question_item in generate_quiz_questions(quiz_topic, missing, avoid_questions=avoid_questions):
+            if question_key(question_item) not in seen_keys:
+                seen_keys.add(question_key(question_item))
+                yield question_item
+
+def serve_from_bank(bank, quiz_topic, num_questions, include_seen=False, cancel_event=None, mark_served=True):
+    """Pytania z banku; model dogenerowuje tylko brakującą część.
+
+    Z mark_served=False pytania nie są oznaczane jako zadane - robi to wywołujący,
+    gdy runda faktycznie się zaczyna (np. przy pytaniach pobranych z wyprzedzeniem).
+    """
+    questions_list = bank.sample(quiz_topic, num_questions, include_seen)
+    if questions_list:
+        log(f"Z banku pytań: {len(questions_list)} z {num_questions}.")
+
+    # Druga próba, gdy część nowych pytań okazała się duplikatami z banku
+    for _ in range(2):
+        missing = num_questions - len(questions_list)
+        if missing <= 0:
+            break
+        # Pytania już zapisane w banku nie są powtarzane przez model
+        avoid_questions = bank.question_texts(quiz_topic, MAX_AVOID_QUESTIONS)
+        new_questions = generate_quiz_questions(quiz_topic, missing, cancel_event, avoid_questions)
+        questions_list += bank.add_questions(quiz_topic, new_questions)
+
+    questions_list = questions_list[:num_questions]
+    if mark_served:
+        bank.mark_served(questions_list)
+    return questions_list
+
+def stream_from_bank(bank, quiz_topic, num_questions, include_seen=False):
+    """Jak serve_from_bank, ale brakujące pytania są strumieniowane i od razu zapisywane w banku."""
+    questions_list = bank.sample(quiz_topic, num_questions, include_seen)
+    if questions_list:
+        log(f"Z banku pytań: {len(questions_list)} z {num_questions}.")
+    bank.mark_served(questions_list)
+    yield from questions_list
+
+    missing = num_questions - len(questions_list)
+    if missing > 0:
+        avoid_questions = bank.question_texts(quiz_topic, MAX_AVOID_QUESTIONS)
+        for question_item in stream_quiz_questions(quiz_topic, missing, avoid_questions):
+            added = bank.add_questions(quiz_topic, [question_item])
+            bank.mark_served(added)
+            yield from added
+
+class QuizPrefetcher:
+    """Generuje zestaw pytań na kolejną rundę w wątku w tle, gdy trwa bieżący quiz.
+
+    current_round to pytania bieżącej rundy, których kolejna ma nie powtarzać; gdy runda
+    jest jeszcze strumieniowana, wait_for to zdarzenie końca jej generowania.
+    """
+
+    def __init__(self, fetch_questions, quiz_topic, current_round=(), wait_for=None):
+        self.quiz_topic = quiz_topic
+        self.current_round = current_round
+        self.wait_for = wait_for
+        self.cancel_event = threading.Event()
+        self._questions = []
+        self._thread = threading.Thread(target=self._run, args=(fetch_questions,), daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self, fetch_questions):
+        _set_quiet(True)
+        if self.wait_for:
+            # Dopiero gdy pytania bieżącej rundy są w banku, sampling i model mogą je pominąć
+            self.wait_for.wait()
+        if self.cancel_event.is_set():
+            return
+        avoid_questions = [question_item["question"] for question_item in self.current_round]
+        try:
+            questions_list = fetch_questions(self.quiz_topic, self.cancel_event, avoid_questions)
+        except Exception:
+            questions_list = []
+        if not self.cancel_event.is_set():
+            self._questions = questions_list
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def result(self):
+        """Czeka na zakończenie generowania (zwykle już gotowe) i zwraca pytania."""
+        if self.cancel_event.is_set():
+            return []
+        self._thread.join()
+        return self._questions
+
+def is_answer_correct(user_answer, correct_answer):
+    # Porównanie znormalizowanych liter
+    return str(user_answer).strip().lower() == str(correct_answer).strip().lower()
+
+def score_answers(answer_records):
+    """Zwraca (poprawne, wszystkie, procent) dla rekordów z polami user_answer i correct_answer."""
+    correct_count = sum(
+        1 for answer_record in answer_records
+        if is_answer_correct(answer_record["user_answer"], answer_record["correct_answer"])
+    )
+    total_count = len(answer_records)
+    percentage_score = round(100 * correct_count / max(1, total_count))
+    return correct_count, total_count, percentage_score
+
+def grade_label(percentage_score):
+    if percentage_score >= 90:
+        return "SUPER"
+    if percentage_score >= 60:
+        return "OK"
+    return "SPRÓBUJ JESZCZE RAZ"
+
+def run_quiz(questions_list, on_quit=None):
     collected_answers = []
     print("\n=== Zaczynamy quiz! ===\n")
     question_number = 1
@@ -119,11 +526,15 @@ def run_quiz(questions_list):
                 user_choice = input("Twoja odpowiedź (a/b/c/d, q = zakończ): ").strip().lower()
             except EOFError:
                 print("\nWejście zakończone. Kończę quiz.")
+                if on_quit:
+                    on_quit()
                 return collected_answers
             if user_choice in ("a", "b", "c", "d"):
                 break
             if user_choice == "q":
                 print("Zakończono na życzenie użytkownika.")
+                if on_quit:
+                    on_quit()
                 return collected_answers
             print("Niepoprawny wybór. Wpisz a, b, c, d lub q.")
 
@@ -144,29 +555,16 @@ def run_quiz(questions_list):
         print("")
         question_number += 1
 
-    correct_count = 0
-    for answer_record in collected_answers:
-        # Porównanie już znormalizowanych liter
-        if answer_record["user_answer"] == answer_record["correct_answer"]:
-            correct_count += 1
-
-    total_count = len(collected_answers)
+    correct_count, total_count, percentage_score = score_answers(collected_answers)
     print("=== Wynik ===")
     print(f"Poprawnych: {correct_count} / {total_count}")
     print(f"Niepoprawnych: {total_count - correct_count}")
-    percentage_score = round(100 * correct_count / max(1, total_count))
     print(f"Wynik procentowy: {percentage_score}%")
-
-    if percentage_score >= 90:
-        print("Ocena: SUPER")
-    elif percentage_score >= 60:
-        print("Ocena: OK")
-    else:
-        print("Ocena: SPRÓBUJ JESZCZE RAZ")
+    print(f"Ocena: {grade_label(percentage_score)}")
 
     print("\n=== Podsumowanie odpowiedzi ===")
     for answer_record in collected_answers:
-        is_correct = (answer_record["user_answer"] == answer_record["correct_answer"])
+        is_correct = is_answer_correct(answer_record["user_answer"], answer_record["correct_answer"])
         status_text = "poprawna" if is_correct else "niepoprawna"
         print(f"Pytanie {answer_record['number']}: {status_text}")
 
@@ -182,7 +580,69 @@ def run_quiz(questions_list):
     if correct_count == total_count and total_count > 0:
         print("Świetnie! Wszystkie odpowiedzi poprawne.")
 
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Quiz tematyczny z AI")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Zaczynaj quiz od pierwszego wygenerowanego pytania, nie czekając na całą listę",
+    )
+    parser.add_argument(
+        "--bank",
+        default=DEFAULT_BANK_PATH,
+        help=f"Plik bazy pytań SQLite (domyślnie {DEFAULT_BANK_PATH})",
+    )
+    parser.add_argument(
+        "--no-bank",
+        action="store_true",
+        help="Nie korzystaj z banku pytań; zawsze generuj nowe",
+    )
+    parser.add_argument(
+        "--next-topic",
+        help="Temat kolejnej rundy generowanej w tle (domyślnie ten sam temat)",
+    )
+    parser.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="Nie generuj kolejnej rundy w tle podczas quizu",
+    )
+    parser.add_argument(
+        "--repeat",
+        action="store_true",
+        help="Pozwól na pytania zadane już wcześniej, gdy brakuje nowych",
+    )
+    return parser.parse_args()
+
+def start_stream(bank, quiz_topic, num_questions, include_seen, round_questions):
+    """Zwraca (iterator pytań od pierwszego gotowego pytania lub None przy błędzie, zdarzenie końca).
+
+    Strumień jest czytany w wątku w tle niezależnie od tempa odpowiedzi; gotowe pytania
+    trafiają też do round_questions, a zdarzenie jest ustawiane po zakończeniu generowania.
+    """
+    if bank:
+        questions_stream = stream_from_bank(bank, quiz_topic, num_questions, include_seen)
+    else:
+        questions_stream = stream_quiz_questions(quiz_topic, num_questions)
+    ready = queue.Queue()
+    finished = threading.Event()
+
+    def drain():
+        try:
+            for question_item in questions_stream:
+                round_questions.append(question_item)
+                ready.put(question_item)
+        finally:
+            ready.put(None)
+            finished.set()
+
+    threading.Thread(target=drain, daemon=True).start()
+    first_question = ready.get()
+    if first_question is None:
+        return None, finished
+    return itertools.chain([first_question], iter(ready.get, None)), finished
+
 def main():
+    args = parse_arguments()
     print("=== Quiz tematyczny z AI ===")
     quiz_topic = input("Podaj temat quizu (np. 'Sztuczna inteligencja', 'Python podstawy'): ").strip()
     if quiz_topic == "":
@@ -198,12 +658,65 @@ def main():
         num_questions = 5
         print("Może ustawię na 5 pytań.")
 
-    questions_list = generate_quiz_questions(quiz_topic, num_questions)
-    if len(questions_list) == 0:
-        print("Nie udało się pobrać poprawnych pytań. Spróbuj inny temat albo inną liczbę pytań.")
-        return
+    bank = None if args.no_bank else QuestionBank(args.bank, key_func=question_key)
+
+    def fetch_questions(topic, cancel_event=None, avoid_questions=None):
+        if bank:
+            # Oznaczane jako zadane dopiero na starcie rundy - anulowany prefetch nie zużywa banku;
+            # pytania poprzednich rund są już w banku, więc ich unika bez avoid_questions
+            return serve_from_bank(bank, topic, num_questions, args.repeat, cancel_event, mark_served=False)
+        return generate_quiz_questions(topic, num_questions, cancel_event, avoid_questions)
+
+    prefetcher = None
+    while True:
+        questions_list = prefetcher.result() if prefetcher and prefetcher.quiz_topic == quiz_topic else None
+        round_questions, stream_finished = [], None
+        if questions_list:
+            print("Pytania na tę rundę są już gotowe.")
+        elif args.stream:
+            # Quiz startuje po pierwszym pytaniu; kolejne są generowane w tle odpowiedzi
+            # (stream_from_bank sam oznacza pytania jako zadane)
+            questions_list, stream_finished = start_stream(
+                bank, quiz_topic, num_questions, args.repeat, round_questions
+            )
+        else:
+            questions_list = fetch_questions(quiz_topic)
+        if not questions_list:
+            print("Nie udało się pobrać poprawnych pytań. Spróbuj inny temat albo inną liczbę pytań.")
+            return
+        if isinstance(questions_list, list):
+            round_questions = questions_list
+            if bank:
+                bank.mark_served(questions_list)
+
+        # Kolejna runda generuje się w tle, gdy użytkownik odpowiada na bieżące pytania;
+        # przy strumieniu dopiero po jego zakończeniu, żeby znała wszystkie pytania tej rundy
+        next_topic = args.next_topic or quiz_topic
+        prefetcher = None if args.no_prefetch else QuizPrefetcher(
+            fetch_questions, next_topic, round_questions, stream_finished
+        ).start()
+        quit_requested = threading.Event()
 
-    run_quiz(questions_list)
+        run_quiz(questions_list, on_quit=quit_requested.set)
+        if quit_requested.is_set():
+            if prefetcher:
+                prefetcher.cancel()
+            return
+
+        try:
+            choice = input(
+                f"Kolejny quiz? Enter = '{next_topic}', wpisz inny temat lub 'q' = koniec: "
+            ).strip()
+        except EOFError:
+            choice = "q"
+        if choice.lower() == "q":
+            if prefetcher:
+                prefetcher.cancel()
+            return
+        quiz_topic = choice or next_topic
+        if prefetcher and prefetcher.quiz_topic != quiz_topic:
+            prefetcher.cancel()
+            prefetcher = None
 
 if __name__ == "__main__":
     main()
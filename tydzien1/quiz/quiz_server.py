@@ -0,0 +1,371 @@
+"""Serwer quizu dla wielu graczy (asyncio, HTTP + JSON, bez dodatkowych zależności).
+
+Pule pytań powstają raz na (temat, liczba pytań) przez generate_quiz_questions
+(lub bank pytań) i są współdzielone przez wszystkich graczy, więc liczba zapytań
+do modelu nie rośnie z liczbą graczy. Odpowiedzi są oceniane po stronie serwera.
+
+    python quiz_server.py --port 8080 --pool "Python podstawy:10"
+
+API:
+    GET  /health
+    GET  /metrics                   metryki w formacie Prometheus (wywołania modelu, tokeny, koszt, opóźnienia)
+    GET  /pools
+    POST /pools                     {"topic": "...", "num_questions": 10}
+    GET  /pools/<pool_id>/leaderboard
+    POST /players                   {"pool_id": "..."} lub {"topic": "...", "num_questions": 10}, opcjonalnie "name"
+    GET  /players/<player_id>/question
+    POST /players/<player_id>/answer {"answer": "a|b|c|d", "index": 0}
+    GET  /players/<player_id>/result
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+
+import quiz
+from llm_common import render_prometheus
+from llm_common.metrics import PROMETHEUS_CONTENT_TYPE
+from question_bank import QuestionBank, normalize_topic
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_BODY_BYTES = 64 * 1024
+MAX_QUESTIONS_PER_POOL = 100
+KEEP_ALIVE_TIMEOUT_SECONDS = 30
+SESSION_TTL_SECONDS = 3600
+CLEANUP_INTERVAL_SECONDS = 60
+LEADERBOARD_SIZE = 10
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    500: "Internal Server Error", 502: "Bad Gateway",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class QuestionPool:
+    def __init__(self, pool_id, topic, questions_list):
+        self.pool_id = pool_id
+        self.topic = topic
+        self.questions = questions_list
+
+    def info(self):
+        return {"pool_id": self.pool_id, "topic": self.topic, "num_questions": len(self.questions)}
+
+    def public_question(self, index):
+        # Poprawna odpowiedź nigdy nie opuszcza serwera przed udzieleniem odpowiedzi
+        question_obj = self.questions[index]
+        return {
+            "index": index,
+            "total": len(self.questions),
+            "question": question_obj["question"],
+            "options": {letter: question_obj[letter] for letter in ("a", "b", "c", "d")},
+        }
+
+
+class PlayerSession:
+    def __init__(self, player_id, pool, name):
+        self.player_id = player_id
+        self.pool = pool
+        self.name = name
+        self.answers = []
+        self.last_seen = time.monotonic()
+
+    @property
+    def current_index(self):
+        return len(self.answers)
+
+    @property
+    def finished(self):
+        return self.current_index >= len(self.pool.questions)
+
+    def result(self):
+        correct_count, total_count, percentage_score = quiz.score_answers(self.answers)
+        return {
+            "player_id": self.player_id,
+            "name": self.name,
+            "correct": correct_count,
+            "answered": total_count,
+            "total": len(self.pool.questions),
+            "percentage": percentage_score,
+            "grade": quiz.grade_label(percentage_score),
+            "finished": self.finished,
+        }
+
+
+class QuizServer:
+    def __init__(self, fetch_questions):
+        self.fetch_questions = fetch_questions
+        self.pools = {}
+        self.players = {}
+        self._pool_tasks = {}
+
+    # --- pule pytań ---
+
+    async def get_pool(self, quiz_topic, num_questions):
+        """Zwraca pulę dla tematu; równoległe żądania czekają na to samo generowanie."""
+        key = (normalize_topic(quiz_topic), num_questions)
+        task = self._pool_tasks.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = asyncio.ensure_future(self._build_pool(quiz_topic, num_questions))
+            self._pool_tasks[key] = task
+        return await asyncio.shield(task)
+
+    async def _build_pool(self, quiz_topic, num_questions):
+        loop = asyncio.get_running_loop()
+        questions_list = await loop.run_in_executor(None, self.fetch_questions, quiz_topic, num_questions)
+        if not questions_list:
+            raise HTTPError(502, "Nie udało się wygenerować pytań.")
+        pool = QuestionPool(secrets.token_urlsafe(8), quiz_topic, questions_list)
+        self.pools[pool.pool_id] = pool
+        return pool
+
+    def _get_pool_by_id(self, pool_id):
+        pool = self.pools.get(pool_id)
+        if pool is None:
+            raise HTTPError(404, "Nie ma takiej puli pytań.")
+        return pool
+
+    # --- gracze ---
+
+    def _get_player(self, player_id):
+        player = self.players.get(player_id)
+        if player is None:
+            raise HTTPError(404, "Nie ma takiego gracza.")
+        player.last_seen = time.monotonic()
+        return player
+
+    async def cleanup_sessions(self):
+        while True:
+            await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+            deadline = time.monotonic() - SESSION_TTL_SECONDS
+            for player_id in [p.player_id for p in self.players.values() if p.last_seen < deadline]:
+                del self.players[player_id]
+
+    # --- obsługa żądań ---
+
+    async def handle_request(self, method, path, payload):
+        parts = [part for part in path.split("?", 1)[0].split("/") if part]
+
+        if parts == ["health"] and method == "GET":
+            return 200, {"status": "ok", "pools": len(self.pools), "players": len(self.players)}
+
+        if parts == ["metrics"] and method == "GET":
+            return 200, self.render_metrics()
+
+        if parts == ["pools"]:
+            if method == "GET":
+                return 200, {"pools": [pool.info() for pool in self.pools.values()]}
+            if method == "POST":
+                pool = await self.get_pool(*_parse_pool_request(payload))
+                return 201, pool.info()
+
+        if len(parts) == 3 and parts[0] == "pools" and parts[2] == "leaderboard" and method == "GET":
+            pool = self._get_pool_by_id(parts[1])
+            results = [p.result() for p in self.players.values() if p.pool is pool]
+            results.sort(key=lambda result: (-result["correct"], result["answered"]))
+            return 200, {"pool_id": pool.pool_id, "leaderboard": results[:LEADERBOARD_SIZE]}
+
+        if parts == ["players"] and method == "POST":
+            if payload.get("pool_id"):
+                pool = self._get_pool_by_id(str(payload["pool_id"]))
+            else:
+                pool = await self.get_pool(*_parse_pool_request(payload))
+            name = str(payload.get("name") or "")[:50]
+            player = PlayerSession(secrets.token_urlsafe(12), pool, name)
+            self.players[player.player_id] = player
+            return 201, {"player_id": player.player_id, **pool.info()}
+
+        if len(parts) == 3 and parts[0] == "players":
+            player = self._get_player(parts[1])
+            if parts[2] == "question" and method == "GET":
+                if player.finished:
+                    return 200, {"finished": True, "result": player.result()}
+                return 200, {"finished": False, **player.pool.public_question(player.current_index)}
+            if parts[2] == "answer" and method == "POST":
+                return 200, self._answer(player, payload)
+            if parts[2] == "result" and method == "GET":
+                return 200, player.result()
+
+        raise HTTPError(404, "Nieznany adres.")
+
+    def render_metrics(self):
+        """Metryki modelu z llm_common oraz stan serwera (tekst Prometheus)."""
+        lines = [
+            "# HELP quiz_pools Liczba pul pytań",
+            "# TYPE quiz_pools gauge",
+            f"quiz_pools {len(self.pools)}",
+            "# HELP quiz_players Liczba aktywnych sesji graczy",
+            "# TYPE quiz_players gauge",
+            f"quiz_players {len(self.players)}",
+        ]
+        return render_prometheus() + "\n".join(lines) + "\n"
+
+    def _answer(self, player, payload):
+        if player.finished:
+            raise HTTPError(409, "Quiz został już ukończony.")
+        if "index" in payload and payload["index"] != player.current_index:
+            # Chroni przed podwójnym wysłaniem tej samej odpowiedzi
+            raise HTTPError(409, f"Oczekiwana odpowiedź na pytanie {player.current_index}.")
+
+        user_answer = str(payload.get("answer", "")).strip().lower()
+        if user_answer not in ("a", "b", "c", "d"):
+            raise HTTPError(400, "Odpowiedź musi być jedną z liter a, b, c, d.")
+
+        question_obj = player.pool.questions[player.current_index]
+        player.answers.append({"user_answer": user_answer, "correct_answer": question_obj["correct_answer"]})
+        return {
+            "correct": quiz.is_answer_correct(user_answer, question_obj["correct_answer"]),
+            "correct_answer": question_obj["correct_answer"],
+            "finished": player.finished,
+            "result": player.result(),
+        }
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), KEEP_ALIVE_TIMEOUT_SECONDS)
+                except HTTPError as e:
+                    await _write_response(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    payload = json.loads(body) if body else {}
+                    if not isinstance(payload, dict):
+                        raise HTTPError(400, "Oczekiwano obiektu JSON.")
+                    status, response = await self.handle_request(method, path, payload)
+                except HTTPError as e:
+                    status, response = e.status, {"error": e.message}
+                except ValueError:
+                    status, response = 400, {"error": "Niepoprawny JSON."}
+                except Exception as e:
+                    status, response = 500, {"error": f"Błąd serwera: {e}"}
+
+                await _write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _parse_pool_request(payload):
+    quiz_topic = str(payload.get("topic") or "").strip() or "ogólna wiedza"
+    try:
+        num_questions = int(payload.get("num_questions", 5))
+    except (TypeError, ValueError):
+        raise HTTPError(400, "num_questions musi być liczbą.")
+    if not 1 <= num_questions <= MAX_QUESTIONS_PER_POOL:
+        raise HTTPError(400, f"num_questions musi być w zakresie 1-{MAX_QUESTIONS_PER_POOL}.")
+    return quiz_topic, num_questions
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Niepoprawne żądanie HTTP.")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        content_length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Niepoprawny nagłówek Content-Length.")
+    if content_length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Zbyt duże żądanie.")
+    body = await reader.readexactly(content_length) if content_length else b""
+    return method.upper(), path, headers, body
+
+
+async def _write_response(writer, status, payload, keep_alive):
+    # Tekst (np. /metrics) wysyłany jest bez zmian, pozostałe odpowiedzi jako JSON
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), PROMETHEUS_CONTENT_TYPE
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+    head = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Serwer quizu dla wielu graczy")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Adres nasłuchu (domyślnie {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (domyślnie {DEFAULT_PORT})")
+    parser.add_argument(
+        "--pool",
+        action="append",
+        default=[],
+        metavar="TEMAT:LICZBA",
+        help="Pula generowana przy starcie, np. 'Python podstawy:10' (można podać wiele razy)",
+    )
+    parser.add_argument("--bank", help="Plik banku pytań SQLite używany do budowy pul")
+    return parser.parse_args()
+
+
+async def serve(args):
+    if args.bank:
+        bank = QuestionBank(args.bank, key_func=quiz.question_key)
+
+        def fetch_questions(quiz_topic, num_questions):
+            return quiz.serve_from_bank(bank, quiz_topic, num_questions, include_seen=True)
+    else:
+        fetch_questions = quiz.generate_quiz_questions
+
+    server = QuizServer(fetch_questions)
+    for pool_spec in args.pool:
+        quiz_topic, _, count_text = pool_spec.rpartition(":")
+        if not quiz_topic or not count_text.isdigit():
+            quiz_topic, count_text = pool_spec, "5"
+        pool = await server.get_pool(quiz_topic, int(count_text))
+        print(f"Pula gotowa: {pool.pool_id} ({pool.topic}, {len(pool.questions)} pytań)")
+
+    tcp_server = await asyncio.start_server(server.handle_connection, args.host, args.port)
+    cleanup_task = asyncio.ensure_future(server.cleanup_sessions())
+    print(f"Serwer quizu działa na http://{args.host}:{args.port}")
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        cleanup_task.cancel()
+
+
+def main():
+    try:
+        asyncio.run(serve(parse_arguments()))
+    except KeyboardInterrupt:
+        print("\nSerwer zatrzymany.")
+
+
+if __name__ == "__main__":
+    main()
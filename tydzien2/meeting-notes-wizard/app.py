@@ -1,136 +1,13 @@
 import streamlit as st
-import os
-import json
-import time
-from openai import OpenAI
-from openai import APIConnectionError, RateLimitError, AuthenticationError, APIStatusError
-from dotenv import load_dotenv
-
-# Configuration constants
-MODEL_NAME = "gpt-4.1-mini"
-MAX_TOKENS_PRIMARY = 800
-MAX_TOKENS_FALLBACK = 1000
-MAX_RETRY_ATTEMPTS = 3
-MIN_NOTES_LENGTH = 50
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-SYSTEM_PROMPT = """Jesteś ekspertem od strukturyzowania notatek ze spotkań.
-Zwracaj wynik WYLACZNIE jako Markdown z naglowkami '##' i DOKLADNYM ukladem jak ponizej.
-
-ZASADY:
-- Jezyk = jezyk wejsciowy (PL/EN)
-- Braki → 'Nie podano'
-- Daty = DD.MM.RRRR
-- Priorytety: Wysoki/Średni/Niski (lub 🔴/🟡/🟢)
-- Zero halucynacji – tylko fakty z notatek
-- Nie pokazuj procesu rozumowania; tylko finalny raport
-- Zwiezlosc: maks. ~600 tokenow
-
-SZABLON:
-## Informacje podstawowe
-- Data: ...
-- Uczestnicy: ...
-- Typ spotkania: ...
-
-## Podsumowanie
-... (2-3 zdania)
-
-## Kluczowe decyzje
-- ...
-- ...
-
-## Action Points
-| Osoba | Zadanie | Deadline | Priorytet |
-|-------|---------|----------|----------|
-| ... | ... | ... | ... |
-| ... | ... | ... | ... |
-
-## Problemy i blokery
-- ...
-- ...
-
-## Następne kroki
-- ...
-- ..."""
-
-EXAMPLE_NOTES = """Spotkanie z zespołem - 25.10.2025
-Jan, Anna, Piotr, Kasia
-Dyskusja o nowym projekcie
-- trzeba zrobic research rynku
-- deadline na koniec miesiaca
-- problem z budzetem - za malo kasy
-- Anna ma sprawdzic konkurencje
-- Piotr zrobi prototyp
-- Kasia przygotuje prezentacje
-- nastepne spotkanie za tydzien
-- blokery: brak dostepu do danych"""
-
-def validate_api_key():
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or not api_key.strip():
-        return "Brak klucza API. Dodaj OPENAI_API_KEY do pliku .env"
-    return None
-
-def extract_text_from_response(response):
-    """Extract text content from OpenAI response object."""
-    # Try direct access first
-    text = getattr(response, "output_text", None)
-    if isinstance(text, str) and text.strip():
-        return text
-    
-    # Simple fallback - return empty string if no text found
-    return ""
-
-def normalize_markdown(md):
-    """Ensure proper Markdown formatting for report sections."""
-    if not isinstance(md, str) or not md:
-        return md
-    
-    sections = ["Informacje podstawowe", "Podsumowanie", "Kluczowe decyzje", 
-                "Action Points", "Problemy i blokery", "Następne kroki"]
-    
-    lines = md.splitlines()
-    out = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped in sections and not stripped.startswith("## "):
-            out.append(f"## {stripped}")
-        else:
-            out.append(line)
-    return "\n".join(out)
-
-def make_api_request(notes_text):
-    """Make API request to OpenAI with simple error handling."""
-    key_error = validate_api_key()
-    if key_error:
-        return None, key_error
-
-    try:
-        response = client.responses.create(
-            model=MODEL_NAME,
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": notes_text}
-            ],
-            max_output_tokens=MAX_TOKENS_PRIMARY
-        )
-        text = extract_text_from_response(response)
-        
-        if not text or not str(text).strip():
-            return None, "Model nie zwrocil tresci. Sprobuj ponownie."
-
-        return normalize_markdown(text), None
-
-    except Exception as e:
-        return None, f"Blad API: {str(e)}"
 
-def structure_notes(notes_text):
-    """Validate input and structure notes using AI."""
-    if not notes_text or len(notes_text.strip()) < MIN_NOTES_LENGTH:
-        return None, f"Wprowadź przynajmniej {MIN_NOTES_LENGTH} znaków notatek."
-    return make_api_request(notes_text)
+from notes_core import (
+    MIN_NOTES_LENGTH,
+    EXAMPLE_NOTES,
+    restructure_notes,
+    structure_notes_structured,
+)
+from report_model import render_markdown
+from audio_pipeline import structure_recording
 
 st.set_page_config(
     page_title="Meeting Notes Wizard",
@@ -144,6 +21,11 @@ st.markdown("**Automatycznie strukturyzuj swoje chaotyczne notatki ze spotkań**
 if 'notes_input' not in st.session_state:
     st.session_state.notes_input = ""
 
+# Previous input/report pair used for incremental updates after small edits
+if 'last_notes' not in st.session_state:
+    st.session_state.last_notes = None
+    st.session_state.last_report = None
+
 col1, col2 = st.columns([1, 1])
 
 with col1:
@@ -161,6 +43,11 @@ notes_input = st.text_area(
     key="notes_input"
 )
 
+structured_mode = st.toggle(
+    "Raport strukturalny (JSON)",
+    help="Model zwraca typowany raport; Markdown jest renderowany lokalnie, a JSON można pobrać."
+)
+
 if structure_button:
     current_notes = st.session_state.get('notes_input', '')
     
@@ -168,7 +55,21 @@ if structure_button:
         st.error(f"Wprowadź przynajmniej {MIN_NOTES_LENGTH} znaków notatek.")
     else:
         with st.spinner("Strukturyzuję notatki..."):
-            result, error = structure_notes(current_notes)
+            report = None
+            if structured_mode:
+                report, error = structure_notes_structured(current_notes)
+                result = render_markdown(report) if report is not None else None
+            else:
+                result, error, incremental = restructure_notes(
+                    current_notes,
+                    st.session_state.last_notes,
+                    st.session_state.last_report
+                )
+                if not error:
+                    st.session_state.last_notes = current_notes
+                    st.session_state.last_report = result
+                    if incremental:
+                        st.caption("Zaktualizowano tylko zmienione sekcje raportu.")
             
             if error:
                 st.error(error)
@@ -179,6 +80,40 @@ if structure_button:
                     st.success("Notatki zostały pomyślnie strukturyzowane!")
                     st.markdown("---")
                     st.markdown(result)
+                    if report is not None:
+                        st.download_button(
+                            "⬇️ Pobierz JSON",
+                            data=report.model_dump_json(indent=2),
+                            file_name="raport.json",
+                            mime="application/json"
+                        )
+
+with st.expander("🎙️ Nagranie spotkania (WAV)"):
+    recording = st.file_uploader("Wgraj nagranie spotkania:", type=["wav"])
+    recording_button = st.button("🎙️ Strukturyzuj nagranie", disabled=recording is None)
+
+if recording_button and recording is not None:
+    progress = st.progress(0.0, text="Transkrybuję nagranie...")
+
+    def show_progress(done, total):
+        progress.progress(done / total, text=f"Transkrypcja: {done}/{total} segmentów")
+
+    with st.spinner("Strukturyzuję nagranie..."):
+        result, error, warnings = structure_recording(recording.getvalue(), on_progress=show_progress)
+
+    if error:
+        st.error(error)
+    elif warnings:
+        st.warning(
+            "Raport powstał bez części nagrania - nie wszystkie fragmenty udało się przetworzyć:\n\n"
+            + "\n".join(f"- {warning}" for warning in warnings)
+        )
+        st.markdown("---")
+        st.markdown(result)
+    else:
+        st.success("Nagranie zostało pomyślnie strukturyzowane!")
+        st.markdown("---")
+        st.markdown(result)
 
 st.markdown("---")
 st.markdown("*Meeting Notes Wizard - Automatyczne strukturyzowanie notatek ze spotkań*")
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""Pipelined audio-to-notes ingestion.
+
+A recording is cut into segments which are transcribed concurrently. As soon
+as consecutive segments are transcribed they are grouped into chunks and sent
+to extraction while later segments are still being transcribed. The extracted
+partial notes are finally merged into the SYSTEM_PROMPT report template, so
+end-to-end time stays close to the transcription time of a single segment.
+
+Only WAV input is supported, so segmentation needs nothing beyond the
+standard library.
+"""
+import io
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from notes_core import (
+    MAX_TOKENS_PRIMARY,
+    MODEL_NAME,
+    extract_text_from_response,
+    get_client,
+    make_api_request,
+    validate_api_key,
+)
+
+SEGMENT_SECONDS = 60
+SEGMENTS_PER_CHUNK = 2
+MAX_TRANSCRIPTION_WORKERS = 4
+MAX_EXTRACTION_WORKERS = 2
+TRANSCRIPTION_MODEL = "gpt-4o-mini-transcribe"
+
+EXTRACTION_PROMPT = """Dostajesz fragment transkrypcji nagrania ze spotkania.
+Wypisz zwiezle notatki w punktach, tylko fakty z fragmentu:
+- data, uczestnicy, typ spotkania (jesli padly)
+- decyzje
+- zadania: osoba, zadanie, deadline, priorytet
+- problemy i blokery
+- nastepne kroki
+Bez wstepu i podsumowania. Jesli fragment nie zawiera faktow, zwroc pusta odpowiedz."""
+
+
+class AudioSegment:
+    def __init__(self, index, start_seconds, end_seconds, wav_bytes):
+        self.index = index
+        self.start_seconds = start_seconds
+        self.end_seconds = end_seconds
+        self.wav_bytes = wav_bytes
+
+
+def split_wav(wav_bytes, segment_seconds=SEGMENT_SECONDS):
+    """Cut a WAV recording into segments of at most segment_seconds each."""
+    with wave.open(io.BytesIO(wav_bytes), "rb") as source:
+        params = source.getparams()
+        frames_per_segment = max(1, int(params.framerate * segment_seconds))
+
+        segments = []
+        start_frame = 0
+        while start_frame < params.nframes:
+            frames = source.readframes(frames_per_segment)
+            frame_count = len(frames) // (params.sampwidth * params.nchannels)
+            if frame_count == 0:
+                break
+
+            buffer = io.BytesIO()
+            with wave.open(buffer, "wb") as target:
+                target.setparams(params)
+                target.writeframes(frames)
+
+            segments.append(AudioSegment(
+                index=len(segments),
+                start_seconds=start_frame / params.framerate,
+                end_seconds=(start_frame + frame_count) / params.framerate,
+                wav_bytes=buffer.getvalue(),
+            ))
+            start_frame += frame_count
+
+    return segments
+
+
+class OpenAITranscriber:
+    """Transcription backend using the OpenAI audio API."""
+
+    def __init__(self, model=TRANSCRIPTION_MODEL):
+        self.model = model
+
+    def transcribe(self, segment):
+        response = get_client().audio.transcriptions.create(
+            model=self.model,
+            file=(f"segment_{segment.index}.wav", segment.wav_bytes),
+        )
+        return getattr(response, "text", "") or ""
+
+
+class LocalTranscriber:
+    """Local stand-in backend: returns prepared texts after a simulated delay."""
+
+    def __init__(self, texts=None, delay_seconds=0.0):
+        self.texts = list(texts) if texts is not None else None
+        self.delay_seconds = delay_seconds
+
+    def transcribe(self, segment):
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        if self.texts is not None:
+            return self.texts[segment.index] if segment.index < len(self.texts) else ""
+        return f"[segment {segment.index}: {segment.start_seconds:.0f}-{segment.end_seconds:.0f}s]"
+
+
+def extract_chunk_notes(transcript):
+    """Condense one transcript chunk into bullet notes. Returns (notes, error)."""
+    key_error = validate_api_key()
+    if key_error:
+        return None, key_error
+
+    try:
+        response = get_client().responses.create(
+            model=MODEL_NAME,
+            input=[
+                {"role": "system", "content": EXTRACTION_PROMPT},
+                {"role": "user", "content": transcript}
+            ],
+            max_output_tokens=MAX_TOKENS_PRIMARY
+        )
+        return extract_text_from_response(response).strip(), None
+
+    except Exception as e:
+        return None, f"Blad API: {str(e)}"
+
+
+def transcribe_and_extract(segments, transcriber, extract=extract_chunk_notes,
+                           segments_per_chunk=SEGMENTS_PER_CHUNK, on_progress=None):
+    """Transcribe segments concurrently and extract notes chunk by chunk.
+
+    Returns (partial_notes, errors), partial notes ordered as in the recording.
+    """
+    transcripts = {}
+    errors = []
+    extraction_futures = []
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=MAX_TRANSCRIPTION_WORKERS) as transcription_pool, \
+            ThreadPoolExecutor(max_workers=MAX_EXTRACTION_WORKERS) as extraction_pool:
+
+        def submit_ready_chunks(final=False):
+            nonlocal next_index
+            while next_index < len(segments):
+                chunk_end = min(next_index + segments_per_chunk, len(segments))
+                ready = all(i in transcripts for i in range(next_index, chunk_end))
+                if not ready or (chunk_end - next_index < segments_per_chunk and not final):
+                    return
+                text = "\n".join(transcripts[i] for i in range(next_index, chunk_end) if transcripts[i])
+                if text.strip():
+                    extraction_futures.append(extraction_pool.submit(extract, text))
+                next_index = chunk_end
+
+        futures = {transcription_pool.submit(transcriber.transcribe, s): s for s in segments}
+        for done_count, future in enumerate(as_completed(futures), 1):
+            segment = futures[future]
+            try:
+                transcripts[segment.index] = future.result().strip()
+            except Exception as e:
+                transcripts[segment.index] = ""
+                errors.append(f"Segment {segment.index + 1}: blad transkrypcji: {e}")
+            if on_progress:
+                on_progress(done_count, len(segments))
+            submit_ready_chunks(final=done_count == len(segments))
+
+        partial_notes = []
+        for future in extraction_futures:
+            notes, error = future.result()
+            if error:
+                errors.append(error)
+            elif notes:
+                partial_notes.append(notes)
+
+    return partial_notes, errors
+
+
+def structure_recording(wav_bytes, transcriber=None, segment_seconds=SEGMENT_SECONDS,
+                        on_progress=None):
+    """Turn a WAV meeting recording into the structured Markdown report.
+
+    Returns (report, error, warnings). warnings lists failed segments and chunks:
+    the report is then built from the rest and parts of the meeting are missing.
+    """
+    try:
+        segments = split_wav(wav_bytes, segment_seconds)
+    except (wave.Error, EOFError) as e:
+        return None, f"Nieprawidlowy plik WAV: {e}", []
+    if not segments:
+        return None, "Nagranie jest puste.", []
+
+    partial_notes, errors = transcribe_and_extract(
+        segments, transcriber or OpenAITranscriber(), on_progress=on_progress
+    )
+    if not partial_notes:
+        return None, errors[0] if errors else "Nie udalo sie wyodrebnic notatek z nagrania.", errors
+
+    report, error = make_api_request("\n\n".join(partial_notes))
+    return report, error, errors
@@ -0,0 +1,51 @@
+"""Import-time benchmark: headless core vs. the Streamlit app.
+
+Each variant runs in a fresh interpreter, so the numbers reflect cold
+start cost as paid by a cron job.
+
+    python bench_import.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+VARIANTS = {
+    "notes_cli --help": [sys.executable, os.path.join(HERE, "notes_cli.py"), "--help"],
+    "import notes_core": [sys.executable, "-c", "import notes_core"],
+    "import streamlit (app.py)": [sys.executable, "-c", "import streamlit"],
+}
+
+
+def measure(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=HERE, capture_output=True)
+        elapsed = time.perf_counter() - start
+        if completed.returncode != 0:
+            return None, completed.stderr.decode("utf-8", "replace").strip().splitlines()[-1:]
+        timings.append(elapsed * 1000)
+    return timings, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pomiar czasu startu modułów Meeting Notes Wizard")
+    parser.add_argument("--runs", type=int, default=5, help="Liczba powtórzeń dla każdego wariantu")
+    args = parser.parse_args(argv)
+
+    print(f"{'wariant':<28} {'mediana':>10} {'min':>10}")
+    for name, command in VARIANTS.items():
+        timings, error = measure(command, max(1, args.runs))
+        if error is not None:
+            print(f"{name:<28} {'błąd':>10}  {' '.join(error)}")
+            continue
+        print(f"{name:<28} {statistics.median(timings):>8.1f}ms {min(timings):>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Headless command line entry point for Meeting Notes Wizard.
+
+Examples:
+    python notes_cli.py notatki.txt
+    cat notatki.txt | python notes_cli.py --format json > raport.json
+    python notes_cli.py notatki.txt --structured
+    python notes_cli.py --audio spotkanie.wav
+"""
+import argparse
+import json
+import sys
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Meeting Notes Wizard - strukturyzowanie notatek ze spotkań bez interfejsu",
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default="-",
+        help="Plik z notatkami (domyślnie '-' = standardowe wejście)",
+    )
+    parser.add_argument(
+        "-f", "--format",
+        choices=["markdown", "json"],
+        default="markdown",
+        help="Format wyniku: markdown (domyślnie) lub json (raport strukturalny)",
+    )
+    parser.add_argument(
+        "-s", "--structured",
+        action="store_true",
+        help="Markdown renderowany lokalnie z raportu strukturalnego (zawsze dla --format json)",
+    )
+    parser.add_argument(
+        "-a", "--audio",
+        action="store_true",
+        help="Plik wejściowy jest nagraniem WAV (transkrypcja i strukturyzowanie)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Plik wynikowy (domyślnie standardowe wyjście)",
+    )
+    return parser.parse_args(argv)
+
+
+def read_notes(path):
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def read_recording(path):
+    if path == "-":
+        return sys.stdin.buffer.read()
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def format_result(report, error, output_format):
+    if output_format == "json":
+        payload = report.model_dump(mode="json") if report is not None else None
+        return json.dumps({"report": payload, "error": error}, ensure_ascii=False, indent=2)
+    if error:
+        return error
+    if isinstance(report, str):
+        return report
+
+    from report_model import render_markdown
+    return render_markdown(report)
+
+
+def write_output(args, output, error):
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    elif error and args.format == "markdown":
+        print(output, file=sys.stderr)
+    else:
+        print(output)
+
+    return 1 if error else 0
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+
+    if args.audio:
+        if args.format == "json" or args.structured:
+            print("Tryb --audio zwraca wyłącznie Markdown.", file=sys.stderr)
+            return 2
+        try:
+            recording = read_recording(args.file)
+        except OSError as e:
+            print(f"Nie udało się wczytać nagrania: {e}", file=sys.stderr)
+            return 2
+
+        from audio_pipeline import structure_recording
+        report, error, warnings = structure_recording(recording)
+        for warning in warnings:
+            print(f"Uwaga: {warning}", file=sys.stderr)
+        if report and warnings:
+            print("Raport nie obejmuje fragmentów, których nie udało się przetworzyć.", file=sys.stderr)
+        return write_output(args, format_result(report, error, args.format), error)
+
+    try:
+        notes_text = read_notes(args.file)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Nie udało się wczytać notatek: {e}", file=sys.stderr)
+        return 2
+
+    # Import deferred until input is known to be readable; keeps --help instant
+    from notes_core import structure_notes, structure_notes_structured
+
+    if args.format == "json" or args.structured:
+        report, error = structure_notes_structured(notes_text)
+    else:
+        report, error = structure_notes(notes_text)
+    return write_output(args, format_result(report, error, args.format), error)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""Core logic of Meeting Notes Wizard, free of any UI imports.
+
+Safe to import from batch jobs and other services: importing this module
+does not pull in Streamlit and does not create the OpenAI client.
+"""
+import difflib
+import os
+
+from dotenv import load_dotenv
+
+# Before importing llm_common, so LLM_* settings from .env are visible to it
+load_dotenv()
+
+from llm_common import DEFAULT_MODEL, get_client as get_llm_client
+
+# Configuration constants
+MODEL_NAME = DEFAULT_MODEL
+MAX_TOKENS_PRIMARY = 800
+MAX_TOKENS_FALLBACK = 1000
+MAX_RETRY_ATTEMPTS = 3
+MIN_NOTES_LENGTH = 50
+# Above this share of changed lines the report is regenerated from scratch
+INCREMENTAL_MAX_CHANGE_RATIO = 0.3
+
+# Report sections in template order (headings of SYSTEM_PROMPT)
+REPORT_SECTIONS = ["Informacje podstawowe", "Podsumowanie", "Kluczowe decyzje",
+                   "Action Points", "Problemy i blokery", "Następne kroki"]
+
+SYSTEM_PROMPT = """Jesteś ekspertem od strukturyzowania notatek ze spotkań.
+Zwracaj wynik WYLACZNIE jako Markdown z naglowkami '##' i DOKLADNYM ukladem jak ponizej.
+
+ZASADY:
+- Jezyk = jezyk wejsciowy (PL/EN)
+- Braki → 'Nie podano'
+- Daty = DD.MM.RRRR
+- Priorytety: Wysoki/Średni/Niski (lub 🔴/🟡/🟢)
+- Zero halucynacji – tylko fakty z notatek
+- Nie pokazuj procesu rozumowania; tylko finalny raport
+- Zwiezlosc: maks. ~600 tokenow
+
+SZABLON:
+## Informacje podstawowe
+- Data: ...
+- Uczestnicy: ...
+- Typ spotkania: ...
+
+## Podsumowanie
+... (2-3 zdania)
+
+## Kluczowe decyzje
+- ...
+- ...
+
+## Action Points
+| Osoba | Zadanie | Deadline | Priorytet |
+|-------|---------|----------|----------|
+| ... | ... | ... | ... |
+| ... | ... | ... | ... |
+
+## Problemy i blokery
+- ...
+- ...
+
+## Następne kroki
+- ...
+- ..."""
+
+STRUCTURED_SYSTEM_PROMPT = """Jesteś ekspertem od strukturyzowania notatek ze spotkań.
+Wypelnij pola raportu WYLACZNIE na podstawie notatek.
+
+ZASADY:
+- Jezyk tresci = jezyk wejsciowy (PL/EN)
+- Braki → 'Nie podano' (w listach: pusta lista)
+- Daty = DD.MM.RRRR
+- Priorytet zadania: high/medium/low
+- Zero halucynacji – tylko fakty z notatek
+- summary: 2-3 zdania"""
+
+INCREMENTAL_SYSTEM_PROMPT = """Jesteś ekspertem od strukturyzowania notatek ze spotkań.
+Dostajesz POPRZEDNI RAPORT (Markdown, naglowki '##') oraz ZMIANY w notatkach (unified diff:
+'-' = usuniete linie, '+' = dodane linie).
+
+ZADANIE:
+- Zwroc WYLACZNIE sekcje raportu, ktore wymagaja zmiany, kazda w calosci z naglowkiem '##'
+- Nazwy i format sekcji bez zmian (jak w poprzednim raporcie)
+- Jesli zadna sekcja nie wymaga zmiany, zwroc dokladnie: BEZ ZMIAN
+- Zero halucynacji – tylko fakty z notatek i poprzedniego raportu"""
+
+NO_CHANGES_MARKER = "BEZ ZMIAN"
+
+EXAMPLE_NOTES = """Spotkanie z zespołem - 25.10.2025
+Jan, Anna, Piotr, Kasia
+Dyskusja o nowym projekcie
+- trzeba zrobic research rynku
+- deadline na koniec miesiaca
+- problem z budzetem - za malo kasy
+- Anna ma sprawdzic konkurencje
+- Piotr zrobi prototyp
+- Kasia przygotuje prezentacje
+- nastepne spotkanie za tydzien
+- blokery: brak dostepu do danych"""
+
+def get_client():
+    """Return the shared LLM client; the OpenAI SDK is loaded on its first call."""
+    return get_llm_client("meeting-notes")
+
+def validate_api_key():
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key or not api_key.strip():
+        return "Brak klucza API. Dodaj OPENAI_API_KEY do pliku .env"
+    return None
+
+def extract_text_from_response(response):
+    """Extract text content from OpenAI response object."""
+    # Try direct access first
+    text = getattr(response, "output_text", None)
+    if isinstance(text, str) and text.strip():
+        return text
+
+    # Simple fallback - return empty string if no text found
+    return ""
+
+def normalize_markdown(md):
+    """Ensure proper Markdown formatting for report sections."""
+    if not isinstance(md, str) or not md:
+        return md
+
+    lines = md.splitlines()
+    out = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped in REPORT_SECTIONS and not stripped.startswith("## "):
+            out.append(f"## {stripped}")
+        else:
+            out.append(line)
+    return "\n".join(out)
+
+def make_api_request(notes_text):
+    """Make API request to OpenAI with simple error handling."""
+    key_error = validate_api_key()
+    if key_error:
+        return None, key_error
+
+    try:
+        response = get_client().responses.create(
+            model=MODEL_NAME,
+            input=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": notes_text}
+            ],
+            max_output_tokens=MAX_TOKENS_PRIMARY
+        )
+        text = extract_text_from_response(response)
+
+        if not text or not str(text).strip():
+            return None, "Model nie zwrocil tresci. Sprobuj ponownie."
+
+        return normalize_markdown(text), None
+
+    except Exception as e:
+        return None, f"Blad API: {str(e)}"
+
+def structure_notes(notes_text):
+    """Validate input and structure notes using AI."""
+    if not notes_text or len(notes_text.strip()) < MIN_NOTES_LENGTH:
+        return None, f"Wprowadź przynajmniej {MIN_NOTES_LENGTH} znaków notatek."
+    return make_api_request(notes_text)
+
+def make_structured_api_request(notes_text):
+    """Request a typed MeetingReport via structured output."""
+    key_error = validate_api_key()
+    if key_error:
+        return None, key_error
+
+    # Pydantic is only needed on this path
+    from report_model import MeetingReport
+
+    try:
+        response = get_client().responses.parse(
+            model=MODEL_NAME,
+            input=[
+                {"role": "system", "content": STRUCTURED_SYSTEM_PROMPT},
+                {"role": "user", "content": notes_text}
+            ],
+            text_format=MeetingReport,
+            max_output_tokens=MAX_TOKENS_FALLBACK
+        )
+        report = getattr(response, "output_parsed", None)
+
+        if not isinstance(report, MeetingReport):
+            return None, "Model nie zwrocil poprawnego raportu. Sprobuj ponownie."
+
+        return report, None
+
+    except Exception as e:
+        return None, f"Blad API: {str(e)}"
+
+def structure_notes_structured(notes_text):
+    """Validate input and extract a typed MeetingReport from the notes."""
+    if not notes_text or len(notes_text.strip()) < MIN_NOTES_LENGTH:
+        return None, f"Wprowadź przynajmniej {MIN_NOTES_LENGTH} znaków notatek."
+    return make_structured_api_request(notes_text)
+
+def compute_notes_delta(previous_notes, current_notes):
+    """Return (unified diff, share of changed lines) between two versions of notes."""
+    previous_lines = previous_notes.strip().splitlines()
+    current_lines = current_notes.strip().splitlines()
+
+    matcher = difflib.SequenceMatcher(None, previous_lines, current_lines, autojunk=False)
+    changed = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            changed += max(i2 - i1, j2 - j1)
+    change_ratio = changed / max(1, len(previous_lines), len(current_lines))
+
+    diff = "\n".join(difflib.unified_diff(
+        previous_lines, current_lines, "poprzednie", "aktualne", lineterm="", n=1
+    ))
+    return diff, change_ratio
+
+def split_report_sections(md):
+    """Split a Markdown report into an ordered {heading: section text} mapping."""
+    sections = {}
+    heading = None
+    for line in md.splitlines():
+        if line.startswith("## "):
+            heading = line[3:].strip()
+            sections[heading] = [line]
+        elif heading is not None:
+            sections[heading].append(line)
+    return {name: "\n".join(lines).rstrip() for name, lines in sections.items()}
+
+def canonical_section(heading):
+    """Template section name for a heading such as 'action points:', or None if unknown."""
+    normalized = " ".join(heading.strip().strip("*_:").split()).casefold()
+    for name in REPORT_SECTIONS:
+        if name.casefold() == normalized:
+            return name
+    return None
+
+def merge_report_sections(previous_report, updated_sections_md):
+    """Replace sections of the previous report with the updated ones.
+
+    Returns None when the update has no sections or a heading outside the
+    template, so the caller can fall back to a full rerun.
+    """
+    updated = split_report_sections(updated_sections_md)
+    if not updated:
+        return None
+
+    merged = {}
+    for heading, text in split_report_sections(previous_report).items():
+        merged[canonical_section(heading) or heading] = text
+    for heading, text in updated.items():
+        name = canonical_section(heading)
+        if name is None:
+            return None
+        body = text.split("\n", 1)[1] if "\n" in text else ""
+        merged[name] = f"## {name}\n{body}".rstrip()
+
+    # Template order first (also for sections new in this update), then any extra
+    # sections of the previous report; text before the first heading is kept
+    preamble = previous_report.split("\n## ", 1)[0].strip() if not previous_report.startswith("## ") else ""
+    parts = [preamble] if preamble else []
+    parts += [merged.pop(name) for name in REPORT_SECTIONS if name in merged]
+    parts += merged.values()
+    return "\n\n".join(parts)
+
+def update_report(previous_report, notes_delta):
+    """Ask the model to update only the sections affected by the notes delta."""
+    key_error = validate_api_key()
+    if key_error:
+        return None, key_error
+
+    user_content = (
+        f"POPRZEDNI RAPORT:\n{previous_report}\n\n"
+        f"ZMIANY W NOTATKACH:\n{notes_delta}"
+    )
+    try:
+        response = get_client().responses.create(
+            model=MODEL_NAME,
+            input=[
+                {"role": "system", "content": INCREMENTAL_SYSTEM_PROMPT},
+                {"role": "user", "content": user_content}
+            ],
+            max_output_tokens=MAX_TOKENS_PRIMARY
+        )
+        text = extract_text_from_response(response)
+
+        if not text or not str(text).strip():
+            return None, "Model nie zwrocil tresci. Sprobuj ponownie."
+        if text.strip() == NO_CHANGES_MARKER:
+            return previous_report, None
+
+        merged = merge_report_sections(previous_report, normalize_markdown(text))
+        if merged is None:
+            return None, "Model zwrocil sekcje spoza szablonu raportu."
+        return merged, None
+
+    except Exception as e:
+        return None, f"Blad API: {str(e)}"
+
+def restructure_notes(notes_text, previous_notes=None, previous_report=None):
+    """Structure notes, reusing the previous report when the edit is small.
+
+    Returns (report, error, incremental), where incremental tells whether the
+    report was produced from the previous one instead of a full rerun.
+    """
+    if not notes_text or len(notes_text.strip()) < MIN_NOTES_LENGTH:
+        return None, f"Wprowadź przynajmniej {MIN_NOTES_LENGTH} znaków notatek.", False
+
+    if previous_notes and previous_report:
+        notes_delta, change_ratio = compute_notes_delta(previous_notes, notes_text)
+        if not notes_delta:
+            return previous_report, None, True
+        if change_ratio <= INCREMENTAL_MAX_CHANGE_RATIO:
+            report, error = update_report(previous_report, notes_delta)
+            if not error:
+                return report, None, True
+
+    report, error = make_api_request(notes_text)
+    return report, error, False
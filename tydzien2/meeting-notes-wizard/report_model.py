@@ -0,0 +1,95 @@
+"""Typed meeting report model and local rendering to the Markdown template.
+
+The model is used as `text_format` for structured output, so consumers get
+parse-free JSON and any other format can be rendered without another API call.
+"""
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel
+
+MISSING_VALUE = "Nie podano"
+
+
+class Priority(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+PRIORITY_LABELS = {
+    Priority.HIGH: "Wysoki",
+    Priority.MEDIUM: "Średni",
+    Priority.LOW: "Niski",
+}
+
+
+class ActionItem(BaseModel):
+    owner: str
+    task: str
+    deadline: str
+    priority: Priority
+
+
+class MeetingReport(BaseModel):
+    date: str
+    participants: List[str]
+    meeting_type: str
+    summary: str
+    decisions: List[str]
+    action_items: List[ActionItem]
+    blockers: List[str]
+    next_steps: List[str]
+
+
+def _bullets(items):
+    items = [item for item in items if item and item.strip()]
+    if not items:
+        return [f"- {MISSING_VALUE}"]
+    return [f"- {item}" for item in items]
+
+
+def _cell(value):
+    # Pipe inside a cell would break the table layout
+    text = (value or "").strip() or MISSING_VALUE
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def render_markdown(report: MeetingReport) -> str:
+    """Render the report using the same layout as SYSTEM_PROMPT's template."""
+    participants = ", ".join(p for p in report.participants if p.strip()) or MISSING_VALUE
+
+    lines = [
+        "## Informacje podstawowe",
+        f"- Data: {report.date or MISSING_VALUE}",
+        f"- Uczestnicy: {participants}",
+        f"- Typ spotkania: {report.meeting_type or MISSING_VALUE}",
+        "",
+        "## Podsumowanie",
+        report.summary or MISSING_VALUE,
+        "",
+        "## Kluczowe decyzje",
+        *_bullets(report.decisions),
+        "",
+        "## Action Points",
+        "| Osoba | Zadanie | Deadline | Priorytet |",
+        "|-------|---------|----------|----------|",
+    ]
+    if report.action_items:
+        for item in report.action_items:
+            lines.append(
+                f"| {_cell(item.owner)} | {_cell(item.task)} | {_cell(item.deadline)} "
+                f"| {PRIORITY_LABELS[item.priority]} |"
+            )
+    else:
+        lines.append(f"| {MISSING_VALUE} | {MISSING_VALUE} | {MISSING_VALUE} | {MISSING_VALUE} |")
+
+    lines += [
+        "",
+        "## Problemy i blokery",
+        *_bullets(report.blockers),
+        "",
+        "## Następne kroki",
+        *_bullets(report.next_steps),
+    ]
+    return "\n".join(lines)
@@ -1,34 +1,29 @@
+from __future__ import annotations
+
 import os
 import sys
 import argparse
 import logging
 from datetime import datetime
-from openai import OpenAI
-from dotenv import load_dotenv
-from pydantic import BaseModel
-from typing import List, Optional, Union, Dict, Any
-from enum import Enum
-
+from typing import TYPE_CHECKING, List, Optional, Union, Dict, Any
 
-class SeverityLevel(str, Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+# openai, pydantic, dotenv i llm_common ładowane są dopiero przy przeglądzie kodu,
+# dzięki czemu --help, --version i błędy argumentów działają bez ich kosztu importu
+if TYPE_CHECKING:
+    from llm_common import LLMClient
+    from review_models import CodeReviewResult
 
+_LAZY_MODELS = ("SeverityLevel", "CodeIssue", "CodeReviewResult")
+# Limit czasu zapytania o przegląd (domyślne 60s z llm_common bywa za krótkie dla dużych plików)
+REVIEW_TIMEOUT_SECONDS = 600.0
 
-class CodeIssue(BaseModel):
-    type: str
-    severity: SeverityLevel
-    description: str
-    file: Optional[str] = None
-    line: Optional[int] = None
 
-
-class CodeReviewResult(BaseModel):
-    overall_score: str
-    found_issues: List[CodeIssue]
-    improved_code: str
+def __getattr__(name: str) -> Any:
+    # PEP 562: code_review_app.CodeReviewResult itp. importują pydantic dopiero przy pierwszym odwołaniu
+    if name in _LAZY_MODELS:
+        import review_models
+        return getattr(review_models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Config:
@@ -70,8 +65,8 @@ def setup_logging() -> logging.Logger:
 
 
 class CodeReviewer:
-    def __init__(self, client: OpenAI) -> None:
-        self.client: OpenAI = client
+    def __init__(self, client: LLMClient) -> None:
+        self.client: LLMClient = client
         self.logger: logging.Logger = setup_logging()
     
     def review_code(self, project_code: str, project_language: str, 
@@ -81,11 +76,13 @@ class CodeReviewer:
         if len(project_code) > Config.MAX_CODE_LENGTH:
             return self._create_length_error_result(len(project_code))
         
+        from review_models import CodeReviewResult
+
         prompt = self._build_prompt(project_code, project_language, grading_scale)
         
         try:
             response = self.client.responses.parse(
-                model="gpt-4.1-mini",
+                model=self.client.model,
                 input=[{"role": "user", "content": prompt}],
                 text_format=CodeReviewResult
             )
@@ -97,6 +94,7 @@ class CodeReviewer:
             return self._create_error_result()
     
     def _create_length_error_result(self, code_length: int) -> CodeReviewResult:
+        from review_models import CodeIssue, CodeReviewResult, SeverityLevel
         return CodeReviewResult(
             overall_score="0%",
             found_issues=[CodeIssue(
@@ -142,6 +140,7 @@ Zastosuj standardy i konwencje właściwe dla tego języka programowania.
 """
     
     def _validate_response(self, response: Any) -> CodeReviewResult:
+        from review_models import CodeReviewResult
         if not hasattr(response, 'output_parsed') or response.output_parsed is None:
             raise ValueError("Odpowiedź z API ma nieprawidłowy format")
         
@@ -157,6 +156,7 @@ Zastosuj standardy i konwencje właściwe dla tego języka programowania.
         return parsed_result
     
     def _create_error_result(self) -> CodeReviewResult:
+        from review_models import CodeReviewResult
         return CodeReviewResult(
             overall_score="0%",
             found_issues=[],
@@ -169,6 +169,7 @@ class CodeReviewApp:
         self.logger: logging.Logger = setup_logging()
         self.logger.info("Inicjalizacja CodeReviewApp")
         
+        from dotenv import load_dotenv
         load_dotenv()
         api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
         
@@ -183,7 +184,10 @@ class CodeReviewApp:
                 "Sprawdź dokumentację OpenAI dla aktualnego formatu kluczy."
             )
         
-        self.client: OpenAI = OpenAI(api_key=api_key)
+        from llm_common import LLMClient
+        # Przegląd z poprawionym kodem generuje się długo; LLM_TIMEOUT_SECONDS nadal ma pierwszeństwo
+        timeout = None if os.getenv("LLM_TIMEOUT_SECONDS", "").strip() else REVIEW_TIMEOUT_SECONDS
+        self.client: LLMClient = LLMClient("code-review", api_key=api_key, timeout=timeout)
         self.reviewer: CodeReviewer = CodeReviewer(self.client)
         self.logger.info("CodeReviewApp zainicjalizowany pomyślnie")
     
@@ -568,8 +572,6 @@ def run_interactive_mode() -> None:
 
 def run_command_line_mode(args: argparse.Namespace) -> None:
     try:
-        app = CodeReviewApp()
-        
         language_map: Dict[str, str] = {
             "python": "Python", "javascript": "JavaScript", "java": "Java",
             "go": "Go", "c++": "C++", "c#": "C#"
@@ -588,6 +590,9 @@ def run_command_line_mode(args: argparse.Namespace) -> None:
         
         print(f"✅ Wczytano kod z pliku: {args.file}")
         print(f"📏 Rozmiar kodu: {len(project_code)} znaków")
+        
+        # Klient i zależności API dopiero po poprawnym wczytaniu pliku
+        app = CodeReviewApp()
         print("🔍 Rozpoczynam przegląd kodu...")
         print(f"Język: {project_language}")
         print(f"Skala oceny: {grading_scale}")
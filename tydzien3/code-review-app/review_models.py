@@ -0,0 +1,30 @@
+"""Modele wyniku przeglądu kodu (structured output dla responses.parse).
+
+Osobny moduł, bo import pydantic jest kosztowny: code_review_app ładuje go
+dopiero przy pierwszym przeglądzie, a nie przy --help czy --version.
+"""
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SeverityLevel(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+class CodeIssue(BaseModel):
+    type: str
+    severity: SeverityLevel
+    description: str
+    file: Optional[str] = None
+    line: Optional[int] = None
+
+
+class CodeReviewResult(BaseModel):
+    overall_score: str
+    found_issues: List[CodeIssue]
+    improved_code: str